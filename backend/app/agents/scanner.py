@@ -6,7 +6,9 @@ import tempfile
 import shutil
 import git
 import json
+import orjson
 import re
+import statistics
 from pathlib import Path
 from functools import partial, lru_cache
 from typing import List, Dict, Any
@@ -64,13 +66,87 @@ def _read_file_cached(file_path: str, max_chars: int = 5000) -> str:
 # NEW: SEMANTIC ANALYSIS (UPDATED FOR OPENROUTER)
 # ============================================================================
 
+async def _review_one_file(sample: Dict[str, str], sem: asyncio.Semaphore) -> Dict[str, Any]:
+    """
+    Micro-review of a single code sample. The semaphore bounds concurrent LLM calls.
+    """
+    review_prompt = f"""You are a Senior Software Architect reviewing a single source file.
+
+**File:** {sample.get('path', 'unknown')}
+```
+{sample.get('content', '')[:3000]}
+```
+
+Recommend a semantic multiplier (0.5 to 1.5) for the architectural quality of this file.
+
+**Output Format (JSON ONLY):**
+{{
+    "semantic_multiplier": <0.5-1.5>,
+    "reasoning": "One or two sentences",
+    "confidence": <0.0-1.0>
+}}
+"""
+    async with sem:
+        response_text = await prompt_manager.call_llm(
+            prompt_text=review_prompt,
+            model=settings.SEMANTIC_MODEL,
+            temperature=0.1,
+            json_mode=True,
+            enable_reasoning=False,
+            stream=True,
+            timeout=30.0
+        )
+    
+    clean_text = response_text.replace("```json", "").replace("```", "").strip()
+    return orjson.loads(clean_text)
+
+
+async def _review_files_concurrently(
+    sample_files: List[Dict[str, str]],
+    max_files: int = 3,
+    max_concurrency: int = 5
+) -> Dict[str, Any]:
+    """
+    Fan out per-file micro-reviews in parallel and aggregate them.
+    The median multiplier caps the influence of a single anomalous file;
+    confidence is the median of the models' own confidences, as in the
+    repository-wide prompt, and review_success_ratio the share of files reviewed.
+    """
+    sem = asyncio.Semaphore(max_concurrency)
+    results = await asyncio.gather(
+        *[_review_one_file(sample, sem) for sample in sample_files[:max_files]],
+        return_exceptions=True
+    )
+    
+    reviews = [r for r in results if isinstance(r, dict)]
+    if not reviews:
+        raise RuntimeError("All per-file reviews failed")
+    
+    multipliers = [float(r.get("semantic_multiplier", 1.0)) for r in reviews]
+    confidences = [float(r.get("confidence", 0.6)) for r in reviews]
+    
+    return {
+        "semantic_multiplier": statistics.median(multipliers),
+        "reasoning": " | ".join(r.get("reasoning", "") for r in reviews),
+        "confidence": statistics.median(confidences),
+        "review_success_ratio": round(len(reviews) / len(results), 2),
+        "validated_patterns": [],
+        "additional_insights": f"Median of {len(reviews)} per-file reviews"
+    }
+
+
 async def _perform_semantic_analysis(
     sample_files: List[Dict[str, str]], 
     architecture_analysis: Dict[str, Any],
-    quality_analysis: Dict[str, Any]
+    quality_analysis: Dict[str, Any],
+    per_file_review: bool = False
 ) -> Dict[str, Any]:
     """
     Perform semantic analysis using OpenRouter (via PromptManager) to assess sophistication.
+    
+    With per_file_review=True (the scanner passes settings.SEMANTIC_PER_FILE_REVIEW),
+    the single repository-wide prompt is replaced by parallel per-file
+    micro-reviews (see _review_files_concurrently).
     """
     
     if not sample_files:
@@ -130,21 +206,26 @@ Output ONLY valid JSON, no markdown, no extra text.
 """
     
     try:
-        # ---------------------------------------------------------
-        # CHANGED: Use prompt_manager.call_llm (OpenAI SDK / OpenRouter)
-        # ---------------------------------------------------------
-        response_text = await prompt_manager.call_llm(
-            prompt_text=semantic_prompt,
-            model=settings.SEMANTIC_MODEL,  # Uses google/gemini-3-flash-preview
-            temperature=0.1,
-            json_mode=True,                 # Force JSON response format
-            enable_reasoning=False          # Semantic analysis is fast, no deep reasoning needed
-        )
-        
-        # Parse response
-        # Sometimes models wrap JSON in markdown blocks even with json_mode
-        clean_text = response_text.replace("```json", "").replace("```", "").strip()
-        gemini_analysis = json.loads(clean_text)
+        if per_file_review:
+            gemini_analysis = await _review_files_concurrently(sample_files)
+        else:
+            # ---------------------------------------------------------
+            # CHANGED: Use prompt_manager.call_llm (OpenAI SDK / OpenRouter)
+            # ---------------------------------------------------------
+            response_text = await prompt_manager.call_llm(
+                prompt_text=semantic_prompt,
+                model=settings.SEMANTIC_MODEL,  # Uses google/gemini-3-flash-preview
+                temperature=0.1,
+                json_mode=True,                 # Force JSON response format
+                enable_reasoning=False,         # Semantic analysis is fast, no deep reasoning needed
+                stream=True,                    # Cancellable: timeout aborts the upstream call
+                timeout=30.0
+            )
+            
+            # Parse response
+            # Sometimes models wrap JSON in markdown blocks even with json_mode
+            clean_text = response_text.replace("```json", "").replace("```", "").strip()
+            gemini_analysis = orjson.loads(clean_text)
     
     except Exception as e:
         print(f"⚠️ Semantic analysis failed: {e}")
@@ -175,7 +256,8 @@ Output ONLY valid JSON, no markdown, no extra text.
         "gemini_insights": {
             "validated_patterns": gemini_analysis.get("validated_patterns", []),
             "additional_insights": gemini_analysis.get("additional_insights", ""),
-            "confidence": gemini_analysis.get("confidence", 0.6)
+            "confidence": gemini_analysis.get("confidence", 0.6),
+            "review_success_ratio": gemini_analysis.get("review_success_ratio")
         },
         "reasoning": gemini_analysis.get("reasoning", "Automated semantic analysis completed"),
         "multi_step_analysis": True,
@@ -465,7 +547,8 @@ async def scan_codebase(state: AnalysisState) -> AnalysisState:
         semantic_report = await _perform_semantic_analysis(
             sample_files,
             architecture_analysis,
-            quality_analysis
+            quality_analysis,
+            per_file_review=settings.SEMANTIC_PER_FILE_REVIEW
         )
         
         
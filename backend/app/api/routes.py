@@ -27,7 +27,7 @@ from fastapi.responses import StreamingResponse
 import asyncio
 
 # Add this import at the top
-from app.utils.sse import live_log_queues
+from app.utils.sse import register_job, unregister_job, get_queue_metrics, drain_batch, format_event
 
 # Initialize Router & Logger
 router = APIRouter()
@@ -360,6 +360,11 @@ def _format_state_to_response(job_id, repo_url, result):
 async def list_jobs():
     return {"total_jobs": len(analysis_jobs), "jobs": [{"id": k, "status": v["status"]} for k,v in analysis_jobs.items()]}
 
+@router.get("/metrics")
+async def live_log_metrics():
+    """Live-log registry size, plus queue depth and dropped events per job"""
+    return {"live_log_queues": get_queue_metrics()}
+
 # Add this to backend/app/api/routes.py
 
 
@@ -370,24 +375,32 @@ async def list_jobs():
 async def stream_live_logs(job_id: str):
     """SSE endpoint for streaming live agent logs to frontend"""
     async def event_generator():
-        if job_id not in live_log_queues:
-            live_log_queues[job_id] = asyncio.Queue()
-        
-        queue = live_log_queues[job_id]
+        queue = register_job(job_id)
         
         try:
             while True:
                 try:
-                    log = await asyncio.wait_for(queue.get(), timeout=30.0)
-                    yield f"data: {json.dumps(log)}\n\n"
+                    # Drain queued logs in batches: one network write per batch,
+                    # still one SSE event per log for the frontend
+                    batch = await drain_batch(queue, max_items=64, max_wait=30.0)
                     
-                    # ✅ ADD: Check if job is complete
-                    if log.get("agent") == "reporter" and log.get("status") == "success":
-                        # Send final message and close
-                        yield f"data: {json.dumps({'event': 'complete'})}\n\n"
+                    frames = []
+                    complete = False
+                    for log in batch:
+                        frames.append(format_event(log))
+                        
+                        # ✅ ADD: Check if job is complete
+                        if log.get("agent") == "reporter" and log.get("status") == "success":
+                            # Send final message and close
+                            frames.append(f"data: {json.dumps({'event': 'complete'})}\n\n")
+                            complete = True
+                            break
+                    
+                    yield "".join(frames)
+                    if complete:
                         break
                         
-                except asyncio.TimeoutError:
+                except TimeoutError:
                     # Send keep-alive ping
                     yield f": keepalive\n\n"
                     
@@ -400,8 +413,7 @@ async def stream_live_logs(job_id: str):
         except asyncio.CancelledError:
             pass
         finally:
-            if job_id in live_log_queues:
-                del live_log_queues[job_id]
+            unregister_job(job_id)
     
     return StreamingResponse(
         event_generator(),
@@ -171,6 +171,9 @@ class Settings(BaseSettings):
     ENABLE_CODE_ANALYSIS_TOOLS: bool = True
     ENABLE_LEARNING_RESOURCE_TOOLS: bool = True
     TOOL_TIMEOUT_SECONDS: int = 30
+    
+    # Scanner: parallel per-file semantic reviews instead of one repository-wide prompt
+    SEMANTIC_PER_FILE_REVIEW: bool = False
 
     class Config:
         env_file = ".env"
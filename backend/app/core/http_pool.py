@@ -0,0 +1,28 @@
+"""
+Shared HTTP Connection Pool
+One keep-alive pool per process for LiteLLM in the evaluation/optimizer scripts
+(judges, metrics). Opik REST pool tuning lives in app.core.opik_http.
+The API server's LLM calls go through the prompt manager's AsyncOpenAI client,
+which keeps its own keep-alive pool.
+"""
+
+import importlib.util
+
+import httpx
+import litellm
+
+# HTTP/2 multiplexing needs the optional 'h2' package
+_HTTP2 = importlib.util.find_spec("h2") is not None
+
+POOL_LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=32)
+
+# Sync only: the scripts run several event loops (background, worker-thread
+# and main), and an httpx.AsyncClient's connections cannot be shared across
+# loops, so litellm.acompletion keeps LiteLLM's own per-call async clients
+shared_http_client = httpx.Client(limits=POOL_LIMITS, http2=_HTTP2)
+
+
+def configure_litellm():
+    """Route every litellm.completion through the shared pool (idempotent)"""
+    litellm.client_session = shared_http_client
+
@@ -84,8 +84,11 @@
 # backend/app/core/opik_config.py
 import opik
 from opik import Opik
+from datetime import datetime, timezone
 from functools import wraps
 from app.core.config import settings
+from app.core.opik_http import tune_opik_client
+from app.tools.opik_batcher import create_batcher, trace_sink
 
 # 1. Define Project Routing (Critical for Evaluation/Optimization)
 # This separates your production traces from your experimental optimization runs
@@ -115,9 +118,18 @@ class OpikManager:
                 workspace=settings.OPIK_WORKSPACE,
                 host="https://www.comet.com/opik/api"
             )
+            tune_opik_client(cls._clients[project_name])
             
         return cls._clients[project_name]
 
+# Standalone main-project traces are coalesced: one client flush per batch
+# (size 50 or every 5s, remaining events flushed at exit)
+main_trace_batcher = create_batcher(
+    trace_sink(lambda: OpikManager.get_client(MAIN_PROJECT)),
+    max_batch=50,
+    flush_interval=5.0
+)
+
 def track_agent(
     name: str,
     agent_type: str = "tool",
@@ -126,19 +138,22 @@ def track_agent(
 ):
     """Decorator that tracks agent execution"""
     def decorator(func):
+        target_project = project or MAIN_PROJECT
+        
+        # Built once per agent; opik.track records the output before the
+        # span/trace ends and ships it through the SDK's background queue
+        tracked_func = opik.track(
+            name=name,
+            type=agent_type,
+            project_name=target_project,
+            tags=tags or []
+        )(func)
+        
         @wraps(func)
         async def wrapper(*args, **kwargs):
-            target_project = project or MAIN_PROJECT
             # Ensure client exists
             OpikManager.get_client(target_project)
             
-            tracked_func = opik.track(
-                name=name,
-                type=agent_type,
-                project_name=target_project,
-                tags=tags or []
-            )(func)
-            
             result = await tracked_func(*args, **kwargs)
             return result
         
@@ -146,14 +161,17 @@ def track_agent(
     return decorator
 
 def log_to_main_project(name: str, input_data: dict, output_data: dict, metadata: dict = None):
-    client = OpikManager.get_client(MAIN_PROJECT)
-    client.trace(
-        name=name,
-        input=input_data,
-        output=output_data,
-        tags=["production", "main"],
-        metadata=metadata or {}
-    )
+    # Timestamped now: the batched trace is only created at the next flush
+    logged_at = datetime.now(timezone.utc)
+    main_trace_batcher.enqueue({
+        "name": name,
+        "start_time": logged_at,
+        "end_time": logged_at,
+        "input": input_data,
+        "output": output_data,
+        "tags": ["production", "main"],
+        "metadata": metadata or {}
+    })
 
 
 def log_evaluation_trace(name: str, input_data: dict, output_data: dict, scores: dict, experiment_name: str, model_info: dict = None):
@@ -0,0 +1,53 @@
+"""
+Opik REST Connection Pool
+Widens the Opik SDK's httpx pool and adds connect retries.
+Imports only httpx/httpcore (already loaded by the SDK), so the API server
+can use it without pulling in LiteLLM.
+"""
+
+import httpcore
+import httpx
+
+OPIK_POOL_LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=32)
+
+# Retries on connection failures; Opik's REST layer already retries 429/5xx
+OPIK_CONNECT_RETRIES = 3
+
+
+def tune_opik_client(client) -> bool:
+    """
+    Gives an Opik client's httpx client wider pool limits and connect
+    retries, so concurrent metrics/judges don't queue on a small pool.
+    TLS settings (check_tls_certificate / CA bundle), keep-alive expiry and
+    HTTP version are carried over from the transport Opik configured.
+    Best effort: returns False (client untouched) if the SDK layout differs.
+    """
+    rest_client = getattr(client, "_rest_client", None)
+    wrapper = getattr(rest_client, "_client_wrapper", None)
+    http_client = getattr(wrapper, "httpx_client", None)
+    http_client = getattr(http_client, "httpx_client", http_client)
+
+    if not isinstance(http_client, httpx.Client):
+        return False
+
+    old_transport = getattr(http_client, "_transport", None)
+    old_pool = getattr(old_transport, "_pool", None)
+    ssl_context = getattr(old_pool, "_ssl_context", None)
+    keepalive_expiry = getattr(old_pool, "_keepalive_expiry", None)
+    # Proxied transports (HTTPProxy/SOCKSProxy pools) are left as configured
+    if type(old_pool) is not httpcore.ConnectionPool or ssl_context is None:
+        return False
+
+    http_client._transport = httpx.HTTPTransport(
+        verify=ssl_context,
+        limits=httpx.Limits(
+            max_connections=OPIK_POOL_LIMITS.max_connections,
+            max_keepalive_connections=OPIK_POOL_LIMITS.max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry
+        ),
+        http1=getattr(old_pool, "_http1", True),
+        http2=getattr(old_pool, "_http2", False),
+        retries=OPIK_CONNECT_RETRIES
+    )
+    old_transport.close()
+    return True
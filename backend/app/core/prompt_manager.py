@@ -278,6 +278,7 @@ Prompt Manager - REFACTORED FOR OPENROUTER
 Replaces Google GenAI/Groq clients with a unified OpenAI SDK client.
 """
 
+import asyncio
 import logging
 import json
 from typing import Any, Dict, Optional
@@ -367,7 +368,9 @@ class PromptLibraryManager:
         model: str = settings.DEFAULT_MODEL,
         temperature: float = 0.1,
         json_mode: bool = False,
-        enable_reasoning: bool = False
+        enable_reasoning: bool = False,
+        stream: bool = False,
+        timeout: Optional[float] = None
     ) -> str:
         """
         Executes a call to OpenRouter.
@@ -378,6 +381,8 @@ class PromptLibraryManager:
             temperature: Creativity level (0.0 - 1.0).
             json_mode: If True, forces valid JSON output.
             enable_reasoning: If True, enables thinking tokens (extra_body logic).
+            stream: If True, accumulates the response from streamed chunks.
+            timeout: Seconds before the call is cancelled (closes the upstream stream).
         """
         if not self.llm_available:
             raise ValueError("LLM Client not available")
@@ -404,9 +409,14 @@ class PromptLibraryManager:
         try:
             logger.info(f"🚀 [PromptManager] Calling {model} (JSON={json_mode}, Reasoning={enable_reasoning})")
             
-            response = await self.client.chat.completions.create(**params)
+            if stream:
+                content = await asyncio.wait_for(self._stream_completion(params), timeout=timeout)
+            else:
+                response = await asyncio.wait_for(
+                    self.client.chat.completions.create(**params), timeout=timeout
+                )
+                content = response.choices[0].message.content
             
-            content = response.choices[0].message.content
             if not content:
                 raise ValueError("LLM returned empty response")
                 
@@ -416,6 +426,18 @@ class PromptLibraryManager:
             logger.error(f"❌ [PromptManager] LLM Call Failed: {e}")
             raise e
 
+    async def _stream_completion(self, params: Dict[str, Any]) -> str:
+        """Accumulates a streamed completion. Cancelling this coroutine aborts the upstream call."""
+        response = await self.client.chat.completions.create(**params, stream=True)
+        buf = []
+        try:
+            async for chunk in response:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    buf.append(chunk.choices[0].delta.content)
+        finally:
+            await response.close()
+        return "".join(buf)
+
     def is_healthy(self) -> Dict[str, bool]:
         """Health check for API endpoints."""
         return {
@@ -0,0 +1,104 @@
+"""
+Evaluation Cache
+Content-addressed on-disk caches of agent-graph results and LLM-judge scores
+for replaying experiments
+"""
+
+import hashlib
+import pickle
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import orjson
+
+CACHE_DIR = Path("./eval_cache")
+JUDGE_CACHE_DIR = Path("./judge_cache")
+
+AGENTS_DIR = Path(__file__).resolve().parent.parent / "agents"
+
+
+def _compute_graph_version() -> str:
+    """Hash of the agent sources, so cached states are invalidated when the graph changes"""
+    digest = hashlib.sha256()
+    for path in sorted(AGENTS_DIR.glob("*.py")):
+        digest.update(path.name.encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+GRAPH_VERSION = _compute_graph_version()
+
+
+class AnalysisCache:
+    """
+    Caches final_state dicts keyed by sha256(repo_url|model|GRAPH_VERSION).
+    Entries are pickled and zlib-compressed.
+
+    Usage:
+        cache = AnalysisCache()
+        state = cache.get(repo_url, model)
+        if state is None:
+            state = await runner.run_analysis_internal(...)
+            cache.set(repo_url, model, state)
+    """
+
+    def __init__(self, cache_dir: Path = CACHE_DIR, enabled: bool = True):
+        self.cache_dir = Path(cache_dir)
+        self.enabled = enabled
+
+    def _path(self, repo_url: str, model: str) -> Path:
+        key = hashlib.sha256(f"{repo_url}|{model}|{GRAPH_VERSION}".encode()).hexdigest()
+        return self.cache_dir / f"{key}.pkl.z"
+
+    def get(self, repo_url: str, model: str) -> Optional[Dict[str, Any]]:
+        if not self.enabled:
+            return None
+        path = self._path(repo_url, model)
+        if not path.exists():
+            return None
+        try:
+            return pickle.loads(zlib.decompress(path.read_bytes()))
+        except Exception:
+            return None  # Corrupt entry: treat as a miss
+
+    def set(self, repo_url: str, model: str, state: Dict[str, Any]):
+        if not self.enabled or state.get("errors"):
+            return  # Never cache failed runs
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self._path(repo_url, model)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_bytes(zlib.compress(pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL)))
+        tmp.replace(path)
+
+
+class JudgeCache:
+    """
+    Caches LLM-judge ScoreResults keyed by blake2b(model|metric|inputs).
+    Judge prompts are deterministic in their inputs, so re-running an
+    experiment after changing other metrics costs no judge calls.
+    """
+
+    def __init__(self, cache_dir: Path = JUDGE_CACHE_DIR):
+        self.cache_dir = Path(cache_dir)
+
+    @staticmethod
+    def key(model: str, metric_name: str, *inputs: Any) -> str:
+        payload = orjson.dumps([model, metric_name, *inputs], default=str)
+        return hashlib.blake2b(payload).hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        path = self.cache_dir / f"{key}.pkl"
+        if not path.exists():
+            return None
+        try:
+            return pickle.loads(path.read_bytes())
+        except Exception:
+            return None
+
+    def set(self, key: str, value: Any):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self.cache_dir / f"{key}.pkl"
+        tmp = path.with_suffix(".tmp")
+        tmp.write_bytes(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+        tmp.replace(path)
@@ -0,0 +1,59 @@
+"""
+Shared LLM-as-a-Judge Model
+One LiteLLM-backed judge (and one keep-alive connection pool) per process
+"""
+
+from functools import lru_cache
+from typing import Any, List, Optional
+
+from opik.evaluation.metrics import Hallucination, score_result
+from opik.evaluation.models import LiteLLMChatModel
+
+from app.core.http_pool import configure_litellm
+from app.evaluation.cache import JudgeCache
+
+DEFAULT_JUDGE_MODEL = "openrouter/google/gemini-2.0-flash-001"
+
+# Pooled clients reused by every litellm.completion call in the process
+configure_litellm()
+
+
+@lru_cache(maxsize=None)
+def get_judge_model(model_name: str = DEFAULT_JUDGE_MODEL) -> LiteLLMChatModel:
+    """
+    Returns the process-wide judge for a model name.
+    Pass it as `model=` to Hallucination, AnswerRelevance, etc.
+    """
+    return LiteLLMChatModel(model_name=model_name)
+
+
+class CachedHallucination(Hallucination):
+    """
+    Hallucination metric that reuses judge results from a JudgeCache.
+    Without a cache it behaves exactly like Hallucination.
+    """
+
+    def __init__(self, cache: Optional[JudgeCache] = None, **kwargs: Any):
+        super().__init__(**kwargs)
+        self._judge_cache = cache
+        model = kwargs.get("model")
+        self._cache_model_name = getattr(model, "model_name", model)
+
+    def score(
+        self,
+        input: str,
+        output: str,
+        context: Optional[List[str]] = None,
+        **ignored_kwargs: Any
+    ) -> score_result.ScoreResult:
+        if self._judge_cache is None:
+            return super().score(input=input, output=output, context=context, **ignored_kwargs)
+
+        key = JudgeCache.key(self._cache_model_name, self.name, input, output, context)
+        cached = self._judge_cache.get(key)
+        if cached is not None:
+            return cached
+
+        result = super().score(input=input, output=output, context=context, **ignored_kwargs)
+        self._judge_cache.set(key, result)
+        return result
@@ -0,0 +1,64 @@
+"""
+Shared Prompt-Optimizer Factory
+ChatPrompt / MetaPromptOptimizer construction shared by the optimizer scripts,
+one model client per process
+"""
+
+from typing import Optional
+
+import litellm
+from opik_optimizer import ChatPrompt, MetaPromptOptimizer
+
+from app.core.http_pool import configure_litellm
+
+
+def configure_model_client():
+    """LiteLLM settings shared by every optimizer script (idempotent)"""
+    configure_litellm()
+    litellm.suppress_debug_info = True
+
+
+configure_model_client()
+
+
+def build_prompt(name: str, system: str, user: str, model: str) -> ChatPrompt:
+    """
+    Returns a new system+user ChatPrompt for these arguments.
+
+    Usage:
+        prompt = build_prompt("judge-agent-rubric", template, "Render your verdict.", JUDGE_MODEL)
+    """
+    return ChatPrompt(
+        name=name,
+        messages=[
+            {"role": "system", "content": system},
+            {"role": "user", "content": user}
+        ],
+        model=model
+    )
+
+
+def build_optimizer(
+    model: str,
+    prompts_per_round: int = 2,
+    verbose: int = 1,
+    n_threads: Optional[int] = None,
+    seed: Optional[int] = None
+) -> MetaPromptOptimizer:
+    """
+    Returns a new MetaPromptOptimizer for these settings (optimizers keep
+    state across runs, so callers never share one).
+    Unset n_threads / seed keep the SDK defaults.
+    """
+    kwargs = {}
+    if n_threads is not None:
+        kwargs["n_threads"] = n_threads
+    if seed is not None:
+        kwargs["seed"] = seed
+
+    return MetaPromptOptimizer(
+        model=model,
+        prompts_per_round=prompts_per_round,
+        verbose=verbose,
+        **kwargs
+    )
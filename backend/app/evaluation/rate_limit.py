@@ -0,0 +1,48 @@
+"""
+Evaluation Rate Limiting
+Caps provider requests per minute independently of pipeline concurrency
+"""
+
+import threading
+import time
+from collections import deque
+
+
+class RateLimiter:
+    """
+    Thread-safe sliding-window limiter: at most `max_rate` acquisitions
+    per `time_period` seconds. Blocks the calling thread until a slot frees.
+
+    Usage:
+        limiter = RateLimiter(max_rate=30, time_period=60)
+        with limiter:
+            call_provider()
+    """
+
+    def __init__(self, max_rate: int, time_period: float = 60.0):
+        self.max_rate = max_rate
+        self.time_period = time_period
+        self._lock = threading.Lock()
+        self._stamps = deque()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                while self._stamps and now - self._stamps[0] >= self.time_period:
+                    self._stamps.popleft()
+
+                if len(self._stamps) < self.max_rate:
+                    self._stamps.append(now)
+                    return
+
+                wait = self.time_period - (now - self._stamps[0])
+
+            time.sleep(wait)
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return False
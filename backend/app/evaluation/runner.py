@@ -1,12 +1,16 @@
 import os
 import asyncio
+import logging
 from typing import Dict, Any, Optional
+
 from opik import track
 
 # App Imports
 from app.core.opik_config import OpikManager, PROJECTS
 from app.core.config import settings
 
+logger = logging.getLogger(__name__)
+
 class SkillProtocolEvaluationRunner:
     """
     The engine that runs your agents specifically for evaluation purposes.
@@ -21,7 +25,7 @@ class SkillProtocolEvaluationRunner:
         # 2. Ensure OpenRouter Key is available for Opik/LiteLLM internals
         if not os.getenv("OPENROUTER_API_KEY") and settings.OPENROUTER_API_KEY:
             os.environ["OPENROUTER_API_KEY"] = settings.OPENROUTER_API_KEY
-            print(f"🔑 Configured Evaluation Runner with OpenRouter Key")
+            logger.info("🔑 Configured Evaluation Runner with OpenRouter Key")
     
     @track(name="Repository Analysis", type="tool")
     async def run_analysis_internal(
@@ -37,7 +41,7 @@ class SkillProtocolEvaluationRunner:
         # Lazy import to avoid circular dependency issues
         from app.agents.graph import run_analysis
         
-        print(f"   --> Runner invoking Graph for: {repo_url}")
+        logger.info("--> Runner invoking Graph: %s", repo_url)
         
         # Run the agent graph
         # Note: The agents will use the models defined in settings.py (OpenRouter)
@@ -51,7 +55,7 @@ class SkillProtocolEvaluationRunner:
             return state
             
         except Exception as e:
-            print(f"   ❌ Runner Error: {e}")
+            logger.error("❌ Runner Error for %s: %s", repo_url, e)
             # Return a minimal error state to prevent evaluation crash
             return {
                 "errors": [str(e)],
@@ -22,6 +22,10 @@ from app.api.dashboard_routes import router as dashboard_router
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Hot-path helpers only surface problems; skip formatting of lower levels
+logging.getLogger("app.tools.github").setLevel(logging.WARNING)
+logging.getLogger("app.services.validation.git_analyzer").setLevel(logging.WARNING)
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """
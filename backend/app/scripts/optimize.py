@@ -1,7 +1,12 @@
+import argparse
+from functools import lru_cache
+
 from opik_optimizer import ChatPrompt, MetaPromptOptimizer
 from opik.evaluation.metrics import AgentTaskCompletionJudge
 import opik
 
+from app.evaluation.cache import JudgeCache
+
 client = opik.Opik()
 
 # 1. Define the 'ChatPrompt' object (This is Opik-native)
@@ -17,11 +22,40 @@ optimizer = MetaPromptOptimizer(
 )
 
 # 3. Define the Metric for the Optimizer
+# One judge for the whole run (model client setup happens once)
+judge = AgentTaskCompletionJudge()
+
+# Opt-in (--use-cache): reuse judgments across rounds and runs, keyed on the
+# judge's actual model so a model change never serves stale scores
+judge_cache = None
+judge_model_name = getattr(getattr(judge, "_model", None), "model_name", None)
+
+@lru_cache(maxsize=4096)
+def _cached_judgment(llm_output: str):
+    key = JudgeCache.key(judge_model_name, judge.name, llm_output)
+    cached = judge_cache.get(key)
+    if cached is not None:
+        return cached
+
+    result = judge.score(output=llm_output)
+    judge_cache.set(key, result)
+    return result
+
 def grader_metric(dataset_item, llm_output):
-    judge = AgentTaskCompletionJudge()
-    return judge.score(output=llm_output)
+    if judge_cache is None:
+        return judge.score(output=llm_output)
+    return _cached_judgment(llm_output)
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Optimize the SFIA grader prompt")
+    parser.add_argument("--use-cache", action="store_true", help="Reuse cached judge scores")
+    args = parser.parse_args()
+    if args.use_cache:
+        if judge_model_name is None:
+            print("⚠️ Judge model name unavailable, judge cache disabled")
+        else:
+            judge_cache = JudgeCache()
+
     dataset = client.get_dataset(name="sfia-golden-v1")
     
     # This automatically logs a new 'Optimization' run in your dashboard
@@ -9,10 +9,12 @@ Fixed for Opik SDK 3.0.1:
 
 import os
 import json
+from itertools import islice
+
 import opik
 from opik.evaluation.metrics import score_result
-from opik_optimizer import ChatPrompt, MetaPromptOptimizer
 from app.core.config import settings
+from app.evaluation.optimizer import build_optimizer, build_prompt
 
 # Fix for Opik progress bar bug
 os.environ["OPIK_DISABLE_PROGRESS_BARS"] = "true"
@@ -168,29 +170,31 @@ def main():
             return
         
         # --- CRITICAL FIX 3: Use .get_items() instead of list() ---
+        # Only the first MAX_SAMPLES items are counted and nothing is kept
+        # alive, so the optimizer run doesn't hold the whole dataset in memory
+        MAX_SAMPLES = 20
         try:
             # SDK 3.0+ uses get_content() or items attribute, handling both versions carefully
             if hasattr(dataset, "get_content"):
-                dataset_items = dataset.get_content()
+                items_iter = iter(dataset.get_content())
             elif hasattr(dataset, "get_items"):
-                dataset_items = dataset.get_items()
+                items_iter = iter(dataset.get_items())
             else:
                 # Fallback for some SDK versions
-                dataset_items = list(dataset)
+                items_iter = iter(dataset)
+            available_samples = sum(1 for _ in islice(items_iter, MAX_SAMPLES))
+            del items_iter
         except TypeError:
-             # If list() failed earlier, it means it's not iterable, try to proceed without counting
+             # If iter() failed, it means it's not iterable, try to proceed without counting
              print("⚠️  Could not count dataset items eagerly, proceeding...")
-             dataset_items = []
+             available_samples = 0
 
         print(f"✅ Dataset loaded")
 
         # 3. Create baseline prompt
-        baseline_prompt = ChatPrompt(
-            name="sfia-grader-optimization-baseline",
-            messages=[
-                {
-                    "role": "system",
-                    "content": """You are an Elite SFIA Assessment Specialist.
+        baseline_prompt = build_prompt(
+            "sfia-grader-optimization-baseline",
+            """You are an Elite SFIA Assessment Specialist.
 
 **🎯 MISSION:** Accurately assess SFIA level (1-5) using pre-analyzed data.
 
@@ -242,22 +246,17 @@ def main():
   "confidence": "<high/medium/low>",
   "key_factors": ["<factor1>", "<factor2>", "<factor3>"]
 }
-```"""
-                },
-                {
-                    "role": "user",
-                    "content": "Please analyze this repository and provide your SFIA assessment using the data provided above."
-                }
-            ],
-            model=OPTIMIZER_MODEL 
+```""",
+            "Please analyze this repository and provide your SFIA assessment using the data provided above.",
+            OPTIMIZER_MODEL
         )
 
         print("✅ Baseline prompt created")
 
         # 4. Initialize MetaPrompt Optimizer (SDK 3.0.1 Compatible)
         # --- CRITICAL FIX 4: Updated parameter names ---
-        optimizer = MetaPromptOptimizer(
-            model=OPTIMIZER_MODEL,
+        optimizer = build_optimizer(
+            OPTIMIZER_MODEL,
             prompts_per_round=2,  # CHANGED: 'candidates_per_round' -> 'prompts_per_round'
             # REMOVED: max_iterations=3 (This is now max_trials in optimize_prompt)
             verbose=0,
@@ -271,7 +270,7 @@ def main():
         print(f"Using model: {OPTIMIZER_MODEL}")
         
         # Use smaller sample for testing if dataset items are available
-        sample_size = min(20, len(dataset_items)) if dataset_items else 10
+        sample_size = available_samples or 10
         print(f"Using {sample_size} samples for optimization")
         
         result = optimizer.optimize_prompt(
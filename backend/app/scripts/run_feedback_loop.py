@@ -6,8 +6,11 @@ Automates the "Data Engine":
 3. Adds them to the 'sfia-golden-v1' dataset for future regression testing
 """
 
+import hashlib
 import json
 import logging
+from pathlib import Path
+
 import opik
 from app.core.config import settings
 
@@ -19,6 +22,41 @@ logger = logging.getLogger(__name__)
 TARGET_DATASET = "sfia-golden-v1"
 FEEDBACK_METRIC_NAME = "user_satisfaction"
 
+# Hash of the last uploaded batch; an unchanged batch skips the upload
+# as long as the remote dataset still holds at least that many items
+DATASET_HASH_FILE = Path("./eval_cache/dataset.sha")
+
+
+def _rows_fingerprint(rows: list) -> str:
+    return hashlib.sha256(json.dumps(rows, sort_keys=True, default=str).encode()).hexdigest()
+
+def _remote_item_count(dataset) -> int:
+    """Item count reported by Opik (0 for a deleted/recreated dataset)"""
+    count = getattr(dataset, "dataset_items_count", None)
+    if isinstance(count, int):
+        return count
+    return sum(1 for _ in dataset.get_items())
+
+def _insert_rows(dataset, rows: list) -> int:
+    """
+    One batched insert; if it fails, rows are retried one by one so a bad
+    row is logged and skipped instead of aborting the run. Returns rows inserted.
+    """
+    try:
+        dataset.insert(rows)
+        return len(rows)
+    except Exception as e:
+        logger.warning(f"⚠️ Batch insert failed ({e}), retrying rows individually")
+    
+    inserted = 0
+    for row in rows:
+        try:
+            dataset.insert([row])
+            inserted += 1
+        except Exception as e:
+            logger.warning(f"   ⚠️ Error inserting trace {row['metadata']['source_trace_id']}: {e}")
+    return inserted
+
 def run_flywheel():
     print(f"\n🔄 Starting Feedback Flywheel for project: {settings.OPIK_PROJECT_NAME}")
     
@@ -54,7 +92,7 @@ def run_flywheel():
 
     print(f"📊 Found {len(traces)} candidate traces.")
 
-    new_items_count = 0
+    new_rows = []
     
     for trace in traces:
         try:
@@ -83,9 +121,8 @@ def run_flywheel():
             # Validation: We need both an input URL and a confirmed Level to learn from this
             if repo_url and final_level:
                 
-                # 5. Add to Dataset
-                # Opik handles deduplication automatically based on content hash
-                dataset.insert([{
+                # 5. Collect for a single batched insert
+                new_rows.append({
                     "input": repo_url,
                     "expected_output": str(final_level), # Store as string for consistency
                     "expected_sfia_level": int(final_level),
@@ -94,9 +131,8 @@ def run_flywheel():
                         "mined_at": "feedback_loop_v1",
                         "judge_ruling": trace_metadata.get("judge_ruling", "Human Verified")
                     }
-                }])
+                })
                 
-                new_items_count += 1
                 print(f"   ✨ Mined Trace {trace.id[:8]} -> Repo: {repo_url} (Level {final_level})")
             
             else:
@@ -106,9 +142,26 @@ def run_flywheel():
             logger.warning(f"   ⚠️ Error processing trace {trace.id}: {e}")
             continue
 
+    # 6. Upload once, unless the mined rows are unchanged since the last run
+    # and still present remotely (a deleted/recreated dataset is re-filled)
+    # Opik handles deduplication automatically based on content hash
+    fingerprint = _rows_fingerprint(new_rows)
+    previous = DATASET_HASH_FILE.read_text().strip() if DATASET_HASH_FILE.exists() else None
+    
+    uploaded = 0
+    if new_rows:
+        if fingerprint == previous and _remote_item_count(dataset) >= len(new_rows):
+            print("   ♻️  Mined rows unchanged since last run, skipping upload")
+        else:
+            uploaded = _insert_rows(dataset, new_rows)
+            # Only a complete upload is remembered; partial ones retry next run
+            if uploaded == len(new_rows):
+                DATASET_HASH_FILE.parent.mkdir(parents=True, exist_ok=True)
+                DATASET_HASH_FILE.write_text(fingerprint)
+
     print(f"\n✅ Flywheel Complete.")
     print(f"   📥 Processed: {len(traces)}")
-    print(f"   💾 Added: {new_items_count} new validated examples to '{TARGET_DATASET}'")
+    print(f"   💾 Added: {uploaded} new validated examples to '{TARGET_DATASET}'")
 
 if __name__ == "__main__":
     run_flywheel()
@@ -5,6 +5,8 @@ Supports: Python, TypeScript, JavaScript, Java, Go, Rust, C++, Ruby, PHP, and mo
 
 import os
 import hashlib
+import importlib
+import importlib.util
 import json
 import math
 import re
@@ -17,23 +19,54 @@ try:
     import tree_sitter
     # Import the Language class specifically for wrapping raw pointers
     from tree_sitter import Language, Parser
-    
-    import tree_sitter_python
-    import tree_sitter_javascript
-    import tree_sitter_typescript
-    import tree_sitter_java
-    import tree_sitter_go
-    import tree_sitter_rust
-    import tree_sitter_cpp
-    import tree_sitter_c
-    import tree_sitter_ruby
-    import tree_sitter_php
-    import tree_sitter_c_sharp
     TREE_SITTER_AVAILABLE = True
 except ImportError as e:
     TREE_SITTER_AVAILABLE = False
     print(f"⚠️  Tree-sitter not available: {e}. Falling back to basic analysis.")
 
+TREE_SITTER_LANGUAGE_MODULES = (
+    "tree_sitter_python",
+    "tree_sitter_javascript",
+    "tree_sitter_typescript",
+    "tree_sitter_java",
+    "tree_sitter_go",
+    "tree_sitter_rust",
+    "tree_sitter_cpp",
+    "tree_sitter_c",
+    "tree_sitter_ruby",
+    "tree_sitter_php",
+    "tree_sitter_c_sharp",
+)
+
+
+def _load_language_modules() -> Dict[str, Any]:
+    """
+    Imports only the language bindings that are installed.
+    find_spec() checks presence without running a failing import per missing
+    binding, and one missing language no longer disables the others.
+    """
+    if not TREE_SITTER_AVAILABLE:
+        return {}
+
+    modules = {}
+    missing = []
+    for name in TREE_SITTER_LANGUAGE_MODULES:
+        if importlib.util.find_spec(name) is None:
+            missing.append(name)
+            continue
+        try:
+            modules[name] = importlib.import_module(name)
+        except ImportError:
+            missing.append(name)
+
+    if missing:
+        print(f"⚠️  Tree-sitter bindings not installed: {', '.join(missing)}. Those languages use basic analysis.")
+
+    return modules
+
+
+LANGUAGE_MODULES = _load_language_modules()
+
 # Configuration
 NCRF_HOURS_PER_CREDIT = 30
 
@@ -105,46 +138,51 @@ class UniversalCodeAnalyzer:
             return
 
         # --- FIX 2: HARDCODED BINDINGS BASED ON YOUR LOGS ---
-        # Map extension -> (Module, Function_Name)
+        # Map extension -> (Module name, Function_Name)
         bindings_map = {
             # Standard 'language' attribute
-            '.py': (tree_sitter_python, 'language'),
-            '.js': (tree_sitter_javascript, 'language'),
-            '.jsx': (tree_sitter_javascript, 'language'),
-            '.java': (tree_sitter_java, 'language'),
-            '.go': (tree_sitter_go, 'language'),
-            '.rs': (tree_sitter_rust, 'language'),
-            '.cpp': (tree_sitter_cpp, 'language'),
-            '.c': (tree_sitter_c, 'language'),
-            '.rb': (tree_sitter_ruby, 'language'),
-            '.cs': (tree_sitter_c_sharp, 'language'),
+            '.py': ('tree_sitter_python', 'language'),
+            '.js': ('tree_sitter_javascript', 'language'),
+            '.jsx': ('tree_sitter_javascript', 'language'),
+            '.java': ('tree_sitter_java', 'language'),
+            '.go': ('tree_sitter_go', 'language'),
+            '.rs': ('tree_sitter_rust', 'language'),
+            '.cpp': ('tree_sitter_cpp', 'language'),
+            '.c': ('tree_sitter_c', 'language'),
+            '.rb': ('tree_sitter_ruby', 'language'),
+            '.cs': ('tree_sitter_c_sharp', 'language'),
             
             # Special cases from your logs
-            '.ts': (tree_sitter_typescript, 'language_typescript'),
-            '.tsx': (tree_sitter_typescript, 'language_tsx'), 
-            '.php': (tree_sitter_php, 'language_php'),
+            '.ts': ('tree_sitter_typescript', 'language_typescript'),
+            '.tsx': ('tree_sitter_typescript', 'language_tsx'), 
+            '.php': ('tree_sitter_php', 'language_php'),
         }
 
-        for ext, (module, attr_name) in bindings_map.items():
+        # One Language per binding: '.js'/'.jsx' share theirs
+        languages = {}
+
+        for ext, (module_name, attr_name) in bindings_map.items():
+            module = LANGUAGE_MODULES.get(module_name)
+            if module is None:
+                continue
+
             try:
-                # 1. Get the language object
-                if not hasattr(module, attr_name):
-                    # Try fallback to 'language' if specific failed
-                    if hasattr(module, 'language'):
-                        attr_name = 'language'
-                    else:
+                # 1. Get the language object (fallback to 'language' if the specific one is missing)
+                key = (module_name, attr_name)
+                if key not in languages:
+                    candidate = getattr(module, attr_name, None) or getattr(module, 'language', None)
+                    if candidate is None:
                         # print(f"⚠️  Binding mismatch: {module} has no '{attr_name}'")
                         continue
-                    
-                candidate = getattr(module, attr_name)
-                # Get the raw C-pointer (PyCapsule)
-                native_ptr = candidate() if callable(candidate) else candidate
 
-                # 2. THE CRITICAL FIX: Wrap in Language()
-                lang_wrapper = tree_sitter.Language(native_ptr)
+                    # Get the raw C-pointer (PyCapsule)
+                    native_ptr = candidate() if callable(candidate) else candidate
+
+                    # 2. THE CRITICAL FIX: Wrap in Language()
+                    languages[key] = tree_sitter.Language(native_ptr)
 
                 # 3. Initialize Parser with the wrapper
-                parser = tree_sitter.Parser(lang_wrapper)
+                parser = tree_sitter.Parser(languages[key])
                 
                 self.parsers[ext] = parser
                 # print(f"✅ Loaded {ext} parser")
@@ -6,12 +6,25 @@ Provides statistical confidence bounds for LLM-based assessments
 import math
 from typing import Dict, Any, List
 
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    # Numba is optional: fall back to the plain Python core
+    def njit(*args, **kwargs):
+        def decorator(func):
+            return func
+        return decorator
+
 # ============================================================================
 # BAYESIAN MODEL PARAMETERS
 # ============================================================================
 
 SFIA_LEVELS = [1, 2, 3, 4, 5]
 
+_LOG_SQRT_2PI = 0.5 * math.log(2 * math.pi)
+
 # Conservative priors (based on typical GitHub distribution)
 PRIORS = {
     1: 0.15,  # Beginner scripts
@@ -60,6 +73,23 @@ COMPLEXITY_MEANS = {
 }
 COMPLEXITY_STD = 0.08
 
+# Precomputed log-probabilities (pure functions of the constants above)
+LOG_PRIORS = {lvl: math.log(PRIORS[lvl]) for lvl in SFIA_LEVELS}
+LOG_TEST_TRUE = {lvl: math.log(max(0.01, min(0.99, TEST_PROBABILITIES[lvl]))) for lvl in SFIA_LEVELS}
+LOG_TEST_FALSE = {lvl: math.log(1 - max(0.01, min(0.99, TEST_PROBABILITIES[lvl]))) for lvl in SFIA_LEVELS}
+
+# Vectorised parameters for batch inference (rows follow SFIA_LEVELS)
+# Gaussian feature columns: [avg_mi, complexity_density, git_stability]
+GAUSS_MEANS = np.array([
+    [MI_MEANS[lvl], COMPLEXITY_MEANS[lvl], GIT_STABILITY_MEANS[lvl]]
+    for lvl in SFIA_LEVELS
+])
+GAUSS_STDS = np.array([MI_STD, COMPLEXITY_STD, GIT_STD])
+GAUSS_LOG_NORM = np.log(GAUSS_STDS) + _LOG_SQRT_2PI
+LOG_PRIORS_ARRAY = np.array([LOG_PRIORS[lvl] for lvl in SFIA_LEVELS])
+LOG_TEST_TRUE_ARRAY = np.array([LOG_TEST_TRUE[lvl] for lvl in SFIA_LEVELS])
+LOG_TEST_FALSE_ARRAY = np.array([LOG_TEST_FALSE[lvl] for lvl in SFIA_LEVELS])
+
 
 # ============================================================================
 # LIKELIHOOD FUNCTIONS
@@ -79,6 +109,51 @@ def log_bernoulli(observed: bool, p: float) -> float:
     return math.log(p if observed else (1 - p))
 
 
+# ============================================================================
+# NUMERIC CORE
+# ============================================================================
+
+MI_MEANS_ARRAY = np.array([MI_MEANS[lvl] for lvl in SFIA_LEVELS])
+COMPLEXITY_MEANS_ARRAY = np.array([COMPLEXITY_MEANS[lvl] for lvl in SFIA_LEVELS])
+GIT_MEANS_ARRAY = np.array([GIT_STABILITY_MEANS[lvl] for lvl in SFIA_LEVELS])
+
+
+@njit(cache=True, fastmath=True)
+def _infer_core(
+    avg_mi, complexity_density, has_tests, git_stability, quality_mult,
+    means_mi, means_c, means_g, log_test_true, log_test_false, log_priors
+):
+    """Posterior over SFIA_LEVELS (index-aligned array) for one repository"""
+    n = log_priors.shape[0]
+    log_norm_mi = math.log(MI_STD) + _LOG_SQRT_2PI
+    log_norm_c = math.log(COMPLEXITY_STD) + _LOG_SQRT_2PI
+    log_norm_g = math.log(GIT_STD) + _LOG_SQRT_2PI
+    
+    # Higher quality → higher level probability (0.8-1.5 range to -0.4 to 1.0)
+    quality_boost = (quality_mult - 1.0) * 2.0
+    
+    log_p = np.empty(n)
+    for i in range(n):
+        lp = log_priors[i] + quality_boost
+        lp += -log_norm_mi - (avg_mi - means_mi[i]) ** 2 / (2 * MI_STD ** 2)
+        lp += -log_norm_c - (complexity_density - means_c[i]) ** 2 / (2 * COMPLEXITY_STD ** 2)
+        lp += log_test_true[i] if has_tests else log_test_false[i]
+        
+        if git_stability > 0:
+            lp += -log_norm_g - (git_stability - means_g[i]) ** 2 / (2 * GIT_STD ** 2)
+        
+        log_p[i] = lp
+    
+    # Log-sum-exp trick for numerical stability
+    max_log = log_p.max()
+    total = 0.0
+    for i in range(n):
+        log_p[i] = math.exp(log_p[i] - max_log)
+        total += log_p[i]
+    
+    return log_p / total
+
+
 # ============================================================================
 # BAYESIAN INFERENCE
 # ============================================================================
@@ -100,6 +175,8 @@ class BayesianSFIAValidator:
         best_level = max(probabilities, key=probabilities.get)
         confidence = probabilities[best_level]
         
+        ncrf = metrics.get("ncrf") or {}
+        
         # Get plausible range (any level with > 15% probability)
         plausible_range = sorted([lvl for lvl, p in probabilities.items() if p > 0.15])
         
@@ -109,8 +186,8 @@ class BayesianSFIAValidator:
             "distribution": probabilities,
             "plausible_range": plausible_range,
             "metrics_used": {
-                "maintainability_index": metrics.get("ncrf", {}).get("avg_mi"),
-                "sloc": metrics.get("ncrf", {}).get("total_sloc")
+                "maintainability_index": ncrf.get("avg_mi"),
+                "sloc": ncrf.get("total_sloc")
             }
         }
 
@@ -161,47 +238,72 @@ class BayesianSFIAValidator:
     
     def _infer_level_distribution(self, metrics: Dict[str, Any], git_stability: float) -> Dict[int, float]:
         # Extract evidence
-        avg_mi = metrics.get("ncrf", {}).get("avg_mi", 65.0)
-        complexity_density = metrics.get("ncrf", {}).get("complexity_density", 0.15)
-        has_tests = metrics.get("markers", {}).get("has_tests", False)
+        ncrf = metrics.get("ncrf") or {}
+        avg_mi = ncrf.get("avg_mi", 65.0)
+        complexity_density = ncrf.get("complexity_density", 0.15)
+        markers = metrics.get("markers") or {}
+        has_tests = markers.get("has_tests", False)
         
         # ✅ ADD: Quality multiplier as signal
         quality_mult = metrics.get("quality_multiplier", 1.0)
         
-        log_posteriors = {}
+        posterior = _infer_core(
+            float(avg_mi),
+            float(complexity_density),
+            bool(has_tests),
+            float(git_stability),
+            float(quality_mult),
+            MI_MEANS_ARRAY,
+            COMPLEXITY_MEANS_ARRAY,
+            GIT_MEANS_ARRAY,
+            LOG_TEST_TRUE_ARRAY,
+            LOG_TEST_FALSE_ARRAY,
+            LOG_PRIORS_ARRAY,
+        )
         
-        for level in SFIA_LEVELS:
-            log_p = math.log(PRIORS[level])
-            
-            # Existing likelihoods...
-            log_p += log_gaussian(avg_mi, MI_MEANS[level], MI_STD)
-            log_p += log_gaussian(complexity_density, COMPLEXITY_MEANS[level], COMPLEXITY_STD)
-            log_p += log_bernoulli(has_tests, TEST_PROBABILITIES[level])
-            
-            if git_stability > 0:
-                log_p += log_gaussian(git_stability, GIT_STABILITY_MEANS[level], GIT_STD)
-            
-            # ✅ ADD: Quality multiplier signal
-            # Higher quality → higher level probability
-            quality_boost = (quality_mult - 1.0) * 2.0  # Convert 0.8-1.5 range to -0.4 to 1.0
-            log_p += quality_boost
-            
-            log_posteriors[level] = log_p
+        return {lvl: float(posterior[i]) for i, lvl in enumerate(SFIA_LEVELS)}
+    
+    def infer_batch(self, metrics_list: List[Dict[str, Any]], git_stabilities: List[float]) -> np.ndarray:
+        """
+        Vectorised _infer_level_distribution for N repositories (e.g. a classroom batch).
+
+        Returns:
+            (N, 5) array of posterior probabilities, columns ordered as SFIA_LEVELS
+        """
+        if len(metrics_list) != len(git_stabilities):
+            raise ValueError("metrics_list and git_stabilities must have the same length")
         
-        # Convert log probabilities to normalized probabilities
-        # Use log-sum-exp trick for numerical stability
-        max_log = max(log_posteriors.values())
-        exp_probs = {
-            lvl: math.exp(lp - max_log) 
-            for lvl, lp in log_posteriors.items()
-        }
+        if not metrics_list:
+            return np.empty((0, len(SFIA_LEVELS)))
         
-        total = sum(exp_probs.values())
+        # Stack evidence: gaussian features (N, 3), test markers (N,), quality (N,)
+        ncrfs = [m.get("ncrf") or {} for m in metrics_list]
+        ev = np.array([
+            [ncrf.get("avg_mi", 65.0), ncrf.get("complexity_density", 0.15), git_stab]
+            for ncrf, git_stab in zip(ncrfs, git_stabilities)
+        ], dtype=float)
+        has_tests = np.array([bool((m.get("markers") or {}).get("has_tests", False)) for m in metrics_list])
+        quality_mult = np.array([m.get("quality_multiplier", 1.0) for m in metrics_list], dtype=float)
         
-        return {
-            lvl: prob / total 
-            for lvl, prob in exp_probs.items()
-        }
+        # Gaussian log-likelihoods for all N x 5 x 3 combinations at once
+        z = (ev[:, None, :] - GAUSS_MEANS[None, :, :]) / GAUSS_STDS
+        log_gauss = -0.5 * z * z - GAUSS_LOG_NORM
+        
+        # Git stability is only evidence when present (matches the scalar path)
+        log_gauss[:, :, 2] = np.where(ev[:, 2:3] > 0, log_gauss[:, :, 2], 0.0)
+        
+        log_p = (
+            LOG_PRIORS_ARRAY[None, :]
+            + log_gauss.sum(axis=-1)
+            + np.where(has_tests[:, None], LOG_TEST_TRUE_ARRAY, LOG_TEST_FALSE_ARRAY)
+            + ((quality_mult - 1.0) * 2.0)[:, None]
+        )
+        
+        # Log-sum-exp normalisation along the level axis
+        log_p -= log_p.max(axis=1, keepdims=True)
+        probs = np.exp(log_p)
+        probs /= probs.sum(axis=1, keepdims=True)
+        return probs
     
     def _generate_reasoning(
         self,
@@ -237,7 +339,7 @@ def calculate_maintainability_index(metrics: Dict[str, Any]) -> float:
     Simplified version using SLOC and complexity
     """
     
-    ncrf = metrics.get("ncrf", {})
+    ncrf = metrics.get("ncrf") or {}
     total_sloc = ncrf.get("total_sloc", 100)
     total_complexity = ncrf.get("total_complexity", 10)
     
@@ -258,6 +360,14 @@ def calculate_maintainability_index(metrics: Dict[str, Any]) -> float:
     return round(normalized, 2)
 
 
+# Warm up once at import so the first request doesn't pay JIT latency
+_infer_core(
+    65.0, 0.15, False, 0.5, 1.0,
+    MI_MEANS_ARRAY, COMPLEXITY_MEANS_ARRAY, GIT_MEANS_ARRAY,
+    LOG_TEST_TRUE_ARRAY, LOG_TEST_FALSE_ARRAY, LOG_PRIORS_ARRAY,
+)
+
+
 # ============================================================================
 # SINGLETON
 # ============================================================================
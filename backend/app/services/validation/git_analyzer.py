@@ -3,10 +3,14 @@ Git History Analyzer
 Extracts stability metrics from repository history
 """
 
+import logging
 import subprocess
+from collections import Counter
 from pathlib import Path
 from typing import Optional
 
+logger = logging.getLogger(__name__)
+
 
 class GitAnalyzer:
     """Analyzes git history to determine repository stability"""
@@ -17,7 +21,7 @@ class GitAnalyzer:
         
         Methodology:
         - Consistent commit patterns → high stability
-        - Erratic/bursty commits → low stability
+        - Erratic/bursty commits → low stability (penalised per busiest day)
         
         Returns:
             0-1 score (0.5 = neutral if no git history)
@@ -39,8 +43,9 @@ class GitAnalyzer:
             if not dates:
                 return 0.5
             
-            # Calculate active days
-            unique_days = len(set(dates))
+            # Calculate active days and the busiest single day in one pass
+            day_counts = Counter(dates)
+            unique_days = len(day_counts)
             
             if unique_days == 0:
                 return 0.5
@@ -63,10 +68,16 @@ class GitAnalyzer:
                 # Excessive churn
                 stability = 1.0 / (1.0 + 0.1 * (avg_commits_per_day - 2.0))
             
+            # Bursty days (10+ commits in one day) signal thrashing even
+            # when the overall average looks healthy
+            max_burst = max(day_counts.values())
+            if max_burst > 10:
+                stability -= min(0.15, 0.01 * (max_burst - 10))
+            
             return round(min(0.95, max(0.2, stability)), 2)
             
         except Exception as e:
-            print(f"⚠️ Git analysis failed: {str(e)}")
+            logger.warning("Git analysis failed for %s", repo_path, exc_info=e)
             return 0.5  # Neutral fallback
     
     def _get_commit_count(self, repo_path: str) -> int:
@@ -78,24 +89,25 @@ class GitAnalyzer:
                 timeout=5
             )
             return int(result.decode().strip())
-        except Exception:
+        except Exception as e:
+            logger.debug("Git commit count failed for %s", repo_path, exc_info=e)
             return 0
     
     def _get_commit_dates(self, repo_path: str) -> list:
         """Get list of commit dates (YYYY-MM-DD)"""
         try:
+            # %as yields the short author date (YYYY-MM-DD) directly
             result = subprocess.check_output(
-                ["git", "-C", repo_path, "log", "--pretty=format:%ai"],
+                ["git", "-C", repo_path, "log", "--pretty=format:%as"],
                 stderr=subprocess.DEVNULL,
+                text=True,
                 timeout=5
             )
             
-            log = result.decode()
-            dates = [line.split()[0] for line in log.splitlines() if line.strip()]
+            return result.splitlines()
             
-            return dates
-            
-        except Exception:
+        except Exception as e:
+            logger.debug("Git log failed for %s", repo_path, exc_info=e)
             return []
 
 
@@ -3,10 +3,14 @@ GitHub Tools
 Helper functions for interacting with GitHub API
 """
 
+import logging
 import httpx
+import orjson
 from typing import Dict, Optional, List
 from app.core.config import settings
 
+logger = logging.getLogger(__name__)
+
 
 class GitHubClient:
     """
@@ -45,12 +49,12 @@ class GitHubClient:
                 )
                 
                 if response.status_code == 200:
-                    return response.json()
+                    return orjson.loads(response.content)
                 
                 return None
                 
             except Exception as e:
-                print(f"Error fetching repo info: {str(e)}")
+                logger.warning("Error fetching repo info", exc_info=e)
                 return None
     
     async def check_file_exists(self, owner: str, repo: str, filepath: str) -> bool:
@@ -70,7 +74,8 @@ class GitHubClient:
                 
                 return response.status_code == 200
                 
-            except:
+            except Exception as e:
+                logger.warning("Error checking file %s", filepath, exc_info=e)
                 return False
     
     async def get_workflow_runs(
@@ -105,13 +110,13 @@ class GitHubClient:
                 )
                 
                 if response.status_code == 200:
-                    data = response.json()
+                    data = orjson.loads(response.content)
                     return data.get("workflow_runs", [])
                 
                 return []
                 
             except Exception as e:
-                print(f"Error fetching workflow runs: {str(e)}")
+                logger.warning("Error fetching workflow runs", exc_info=e)
                 return []
     
     async def get_latest_commit(self, owner: str, repo: str) -> Optional[Dict]:
@@ -128,13 +133,13 @@ class GitHubClient:
                 )
                 
                 if response.status_code == 200:
-                    commits = response.json()
+                    commits = orjson.loads(response.content)
                     return commits[0] if commits else None
                 
                 return None
                 
             except Exception as e:
-                print(f"Error fetching latest commit: {str(e)}")
+                logger.warning("Error fetching latest commit", exc_info=e)
                 return None
     
     async def get_languages(self, owner: str, repo: str) -> Dict[str, int]:
@@ -153,12 +158,12 @@ class GitHubClient:
                 )
                 
                 if response.status_code == 200:
-                    return response.json()
+                    return orjson.loads(response.content)
                 
                 return {}
                 
             except Exception as e:
-                print(f"Error fetching languages: {str(e)}")
+                logger.warning("Error fetching languages", exc_info=e)
                 return {}
     
     async def get_rate_limit(self) -> Dict:
@@ -181,13 +186,13 @@ class GitHubClient:
                 )
                 
                 if response.status_code == 200:
-                    data = response.json()
+                    data = orjson.loads(response.content)
                     return data.get("rate", {}).get("core", {})
                 
                 return {}
                 
             except Exception as e:
-                print(f"Error checking rate limit: {str(e)}")
+                logger.warning("Error checking rate limit", exc_info=e)
                 return {}
 
 
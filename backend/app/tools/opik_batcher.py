@@ -0,0 +1,149 @@
+"""
+Opik Batcher
+Coalesces trace/log writes into batches flushed by a single background task
+"""
+
+import asyncio
+import atexit
+import logging
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class OpikBatcher:
+    """
+    Buffers Opik events and hands them to `sink` in batches.
+
+    A batch is flushed when it reaches `max_batch` events or when
+    `flush_interval` seconds have passed since the last flush.
+
+    Usage:
+        batcher = OpikBatcher(sink=trace_sink(get_client))
+        batcher.enqueue({"name": "...", "input": {...}, "output": {...}})
+    """
+
+    def __init__(
+        self,
+        sink: Callable[[List[Dict[str, Any]]], None],
+        max_batch: int = 50,
+        flush_interval: float = 5.0
+    ):
+        self._sink = sink
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._buffer: List[Dict[str, Any]] = []
+        self._last_flush = time.monotonic()
+
+    def enqueue(self, event: Dict[str, Any]):
+        """Queue an event. Outside an event loop it is written immediately."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._write([event])
+            return
+
+        # One flush task per event loop (scripts may run several loops)
+        if self._task is None or self._task.done() or self._task.get_loop() is not loop:
+            self._queue = asyncio.Queue()
+            self._task = loop.create_task(self._flush_loop())
+
+        self._queue.put_nowait(event)
+
+    async def _flush_loop(self):
+        queue = self._queue
+        try:
+            while True:
+                # asyncio.timeout (unlike wait_for) never swallows a cancellation
+                # that races with a completed get()
+                try:
+                    async with asyncio.timeout(self.flush_interval):
+                        event = await queue.get()
+                    self._buffer.append(event)
+                    self._drain(queue)
+                except TimeoutError:
+                    pass
+
+                due = time.monotonic() - self._last_flush > self.flush_interval
+                if len(self._buffer) >= self.max_batch or (self._buffer and due):
+                    # Whoever pops the batch first writes it: the worker thread,
+                    # or this task if it is cancelled before the thread starts
+                    claim = [self._take_buffer()]
+                    try:
+                        await asyncio.to_thread(self._write_claimed, claim)
+                    except asyncio.CancelledError:
+                        self._write_claimed(claim)
+                        raise
+        finally:
+            # Loop shutdown/cancellation: never drop buffered events
+            self._drain(queue)
+            if self._buffer:
+                self._write(self._take_buffer())
+
+    def _drain(self, queue: Optional[asyncio.Queue]):
+        if queue is None:
+            return
+        while True:
+            try:
+                self._buffer.append(queue.get_nowait())
+            except asyncio.QueueEmpty:
+                break
+
+    def _take_buffer(self) -> List[Dict[str, Any]]:
+        batch, self._buffer = self._buffer, []
+        self._last_flush = time.monotonic()
+        return batch
+
+    def _write_claimed(self, claim: List[List[Dict[str, Any]]]):
+        try:
+            batch = claim.pop()
+        except IndexError:
+            return
+        self._write(batch)
+
+    def _write(self, batch: List[Dict[str, Any]]):
+        # Runs in the background: report failures loudly instead of raising
+        try:
+            self._sink(batch)
+        except Exception as e:
+            logger.error("Opik batch write failed, %d events lost", len(batch), exc_info=e)
+
+    async def aclose(self):
+        """Flush everything still queued (lifespan shutdown)"""
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self.flush_sync()
+
+    def flush_sync(self):
+        """Flush everything still queued without an event loop (atexit)"""
+        self._drain(self._queue)
+        if self._buffer:
+            self._write(self._take_buffer())
+
+
+def create_batcher(sink: Callable[[List[Dict[str, Any]]], None], **kwargs) -> OpikBatcher:
+    """Create a batcher whose remaining events are flushed at interpreter exit"""
+    batcher = OpikBatcher(sink, **kwargs)
+    atexit.register(batcher.flush_sync)
+    return batcher
+
+
+def trace_sink(get_client: Callable[[], Any]) -> Callable[[List[Dict[str, Any]]], None]:
+    """
+    Sink that creates one Opik trace per event (event = Opik.trace() kwargs),
+    then flushes the client once for the whole batch
+    """
+    def write(batch: List[Dict[str, Any]]):
+        client = get_client()
+        for trace_kwargs in batch:
+            client.trace(**trace_kwargs)
+        client.flush()
+    
+    return write
@@ -3,18 +3,63 @@ Opik Integration
 Tracing and logging for transparent AI decision-making
 """
 
+import asyncio
+from datetime import datetime, timezone
 from opik import Opik, track
-from opik.evaluation import evaluate
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from functools import wraps
 from app.core.config import settings
+from app.core.opik_http import tune_opik_client
+from app.tools.opik_batcher import create_batcher, trace_sink
 
 
-# Initialize Opik client
-opik_client = Opik(
-    api_key=settings.OPIK_API_KEY,
-    workspace=settings.OPIK_WORKSPACE
-)
+# Opik client is created on first use, not at import
+_opik_client: Optional[Opik] = None
+
+
+def get_opik_client() -> Opik:
+    """
+    Get or create the Opik client singleton
+    """
+    global _opik_client
+    
+    if _opik_client is None:
+        _opik_client = Opik(
+            api_key=settings.OPIK_API_KEY,
+            workspace=settings.OPIK_WORKSPACE
+        )
+        tune_opik_client(_opik_client)
+    
+    return _opik_client
+
+
+# Coalesces standalone decision traces into bulk flushes (size 50 or every 5s)
+batcher = create_batcher(trace_sink(get_opik_client), max_batch=50, flush_interval=5.0)
+
+
+def _scanner_output(state: Dict) -> Dict[str, Any]:
+    scan_metrics = state.get("scan_metrics", {})
+    return {
+        "ncrf": scan_metrics.get("ncrf"),
+        "markers": scan_metrics.get("markers")
+    }
+
+
+# Per-agent extractors: only the requested agent's output is read from state
+_EXTRACTORS = {
+    "validator": lambda state: state.get("validation"),
+    "scanner": _scanner_output,
+    "grader": lambda state: state.get("sfia_result"),
+    "auditor": lambda state: state.get("audit_result"),
+    "reporter": lambda state: {
+        "final_credits": state.get("final_credits"),
+        "certificate": state.get("certificate")
+    }
+}
+
+
+def _no_output(state: Dict) -> Dict[str, Any]:
+    return {}
 
 
 def track_agent(agent_name: str):
@@ -28,11 +73,14 @@ def track_agent(agent_name: str):
     """
     
     def decorator(func):
+        # Resolved once per decorated agent, not on every call
+        extract_output = _EXTRACTORS.get(agent_name, _no_output)
+        
         @wraps(func)
         async def wrapper(state, *args, **kwargs):
             
             # Start Opik trace
-            with opik_client.trace(
+            trace = get_opik_client().trace(
                 name=f"{agent_name}_agent",
                 tags=["agent", agent_name],
                 metadata={
@@ -40,51 +88,33 @@ def track_agent(agent_name: str):
                     "repo_url": state.get("repo_url"),
                     "current_step": agent_name
                 }
-            ) as trace:
-                
-                # Store trace ID in state
-                if not state.get("opik_trace_id"):
-                    state["opik_trace_id"] = trace.id
-                
-                # Execute agent
+            )
+            
+            # Store trace ID in state
+            if not state.get("opik_trace_id"):
+                state["opik_trace_id"] = trace.id
+            
+            # Execute agent
+            try:
                 result = await func(state, *args, **kwargs)
-                
-                # Log agent output
-                trace.log_output({
-                    "progress": result.get("progress"),
-                    "errors": result.get("errors", []),
-                    "agent_output": _get_agent_output(agent_name, result)
-                })
-                
-                return result
+            except Exception as e:
+                trace.end(output={"error": str(e)})
+                raise
+            
+            # Log agent output and close the trace
+            trace.end(output={
+                "progress": result.get("progress"),
+                "errors": result.get("errors", []),
+                "agent_output": extract_output(result)
+            })
+            
+            return result
         
         return wrapper
     
     return decorator
 
 
-def _get_agent_output(agent_name: str, state: Dict) -> Dict[str, Any]:
-    """
-    Extract relevant output from state for each agent
-    """
-    
-    outputs = {
-        "validator": state.get("validation"),
-        "scanner": {
-            "ncrf": state.get("scan_metrics", {}).get("ncrf"),
-            "markers": state.get("scan_metrics", {}).get("markers")
-        },
-        "grader": state.get("sfia_result"),
-        "auditor": state.get("audit_result"),
-        "reporter": {
-            "final_credits": state.get("final_credits"),
-            "certificate": state.get("certificate")
-        }
-    }
-    
-    return outputs.get(agent_name, {})
-
-
 @track
 async def track_llm_call(
     prompt: str,
@@ -132,16 +162,20 @@ def log_decision_point(
         )
     """
     
-    opik_client.log(
-        name=decision_name,
-        input=input_data,
-        output={"decision": output_decision},
-        metadata={
+    # Timestamped now: the batched trace is only created at the next flush
+    logged_at = datetime.now(timezone.utc)
+    batcher.enqueue({
+        "name": decision_name,
+        "start_time": logged_at,
+        "end_time": logged_at,
+        "input": input_data,
+        "output": {"decision": output_decision},
+        "metadata": {
             "reasoning": reasoning,
             **(metadata or {})
         },
-        tags=["decision", "routing"]
-    )
+        "tags": ["decision", "routing"]
+    })
 
 
 async def evaluate_sfia_grading(
@@ -166,26 +200,27 @@ async def evaluate_sfia_grading(
         )
     """
     
-    from opik.evaluation.metrics import Equals
-    
-    dataset = opik_client.create_dataset(
-        name="sfia_ground_truth",
-        description="Manually verified SFIA levels"
-    )
-    
-    dataset.insert([{
-        "input": {"repo_url": repo_url},
-        "expected_output": {"sfia_level": ground_truth_level},
-        "actual_output": {"sfia_level": predicted_level}
-    }])
+    # Exact-match score is free locally: no dataset or evaluate() round-trip
+    score = 1.0 if ground_truth_level == predicted_level else 0.0
     
-    # Evaluate
-    results = evaluate(
-        dataset=dataset,
-        metrics=[Equals()]
+    # One trace carrying the score as feedback (Opik queues it in the background)
+    get_opik_client().trace(
+        name="sfia_grading_accuracy",
+        input={"repo_url": repo_url},
+        output={
+            "expected": ground_truth_level,
+            "actual": predicted_level
+        },
+        feedback_scores=[{"name": "sfia_exact_match", "value": score}],
+        tags=["evaluation", "sfia_ground_truth"]
     )
     
-    return results
+    return {
+        "repo_url": repo_url,
+        "expected": ground_truth_level,
+        "actual": predicted_level,
+        "score": score
+    }
 
 
 class OpikContextManager:
@@ -204,40 +239,53 @@ class OpikContextManager:
         self.job_id = job_id
         self.repo_url = repo_url
         self.trace = None
+        
+        # Built once, reused for the trace open
+        self._metadata = {
+            "job_id": job_id,
+            "repo_url": repo_url
+        }
+        
+        # log_step events, written once with the trace output in __aexit__
+        self._pending: List[Dict[str, Any]] = []
     
     async def __aenter__(self):
-        self.trace = opik_client.trace(
-            name="full_analysis_workflow",
-            tags=["workflow", "full_pipeline"],
-            metadata={
-                "job_id": self.job_id,
-                "repo_url": self.repo_url
-            }
-        ).__enter__()
+        # Opening a trace does network I/O: keep it off the event loop
+        self.trace = await asyncio.to_thread(self._open_trace)
         
         return self
     
+    def _open_trace(self):
+        return get_opik_client().trace(
+            name="full_analysis_workflow",
+            tags=["workflow", "full_pipeline"],
+            metadata=self._metadata
+        )
+    
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         if self.trace:
             if exc_type:
-                self.trace.log_output({
+                output = {
                     "status": "failed",
                     "error": str(exc_val)
-                })
+                }
             else:
-                self.trace.log_output({
+                output = {
                     "status": "success"
-                })
+                }
+            
+            if self._pending:
+                output["steps"] = self._pending
+                self._pending = []
             
-            self.trace.__exit__(exc_type, exc_val, exc_tb)
+            # Output is written as the trace ends
+            self.trace.end(output=output)
     
     def log_step(self, step_name: str, data: Dict):
-        """Log intermediate steps"""
+        """Log intermediate steps (buffered until the workflow exits)"""
         if self.trace:
-            self.trace.log(
-                name=step_name,
-                input=data.get("input", {}),
-                output=data.get("output", {})
-            )
-
-
+            self._pending.append({
+                "name": step_name,
+                "input": data.get("input", {}),
+                "output": data.get("output", {})
+            })
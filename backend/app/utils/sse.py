@@ -1,23 +1,126 @@
 # backend/app/utils/sse.py
 import asyncio
 import json
+import time
 from datetime import datetime
-from typing import Dict
+from typing import Any, Dict, List, Tuple
 
-# Shared event queue for live logs
-# Format: { "job_id": asyncio.Queue }
-live_log_queues: Dict[str, asyncio.Queue] = {}
+# Bound per-job queues so a slow SSE consumer can't grow memory without limit
+LIVE_LOG_QUEUE_SIZE = 2048
+
+# Shared event queue for live logs, one entry per job with an open SSE stream
+# (removed when its last stream closes, so the registry stays bounded)
+# Format: { "job_id": (asyncio.Queue, loop that owns the queue) }
+live_log_queues: Dict[str, Tuple[asyncio.Queue, asyncio.AbstractEventLoop]] = {}
+
+# Open SSE streams per job; the job's queue is dropped when this reaches zero
+live_log_consumers: Dict[str, int] = {}
+
+# Events dropped per job because the consumer fell behind (monotonic)
+live_log_dropped: Dict[str, int] = {}
+
+def register_job(job_id: str) -> asyncio.Queue:
+    """
+    Returns the live-log queue for a job, creating it on the running loop.
+    Must be called from inside the event loop (e.g. the SSE endpoint).
+    """
+    live_log_consumers[job_id] = live_log_consumers.get(job_id, 0) + 1
+    
+    if job_id not in live_log_queues:
+        live_log_queues[job_id] = (
+            asyncio.Queue(maxsize=LIVE_LOG_QUEUE_SIZE),
+            asyncio.get_running_loop()
+        )
+    
+    return live_log_queues[job_id][0]
+
+def unregister_job(job_id: str):
+    """
+    Releases one SSE stream's hold on a job (call when the stream closes).
+    The queue and counters are dropped once the last stream has closed.
+    """
+    remaining = live_log_consumers.get(job_id, 0) - 1
+    if remaining > 0:
+        live_log_consumers[job_id] = remaining
+        return
+    
+    live_log_consumers.pop(job_id, None)
+    live_log_queues.pop(job_id, None)
+    live_log_dropped.pop(job_id, None)
 
 def push_live_log(job_id: str, agent: str, thought: str, status: str = "success"):
     """
     Helper to push logs from agents to the shared queue.
     Does not import any agents, safe for all agents to use.
     """
-    if job_id in live_log_queues:
-        # Using call_soon_threadsafe or create_task to ensure it works in async
-        asyncio.create_task(live_log_queues[job_id].put({
-            "agent": agent,
-            "thought": thought,
-            "status": status,
-            "timestamp": datetime.now().isoformat()
-        }))
\ No newline at end of file
+    if job_id not in live_log_queues:
+        return
+
+    queue, owner_loop = live_log_queues[job_id]
+    event = {
+        "agent": agent,
+        "thought": thought,
+        "status": status,
+        "timestamp": time.time_ns()  # Formatted lazily in format_event()
+    }
+
+    try:
+        running_loop = asyncio.get_running_loop()
+    except RuntimeError:
+        running_loop = None
+
+    if running_loop is owner_loop:
+        # Same loop: enqueue directly, no Task needed
+        _put_drop_oldest(job_id, queue, event)
+    else:
+        # Worker thread or foreign loop: hand off to the owning loop
+        owner_loop.call_soon_threadsafe(_put_drop_oldest, job_id, queue, event)
+
+def _put_drop_oldest(job_id: str, queue: asyncio.Queue, event: dict):
+    """Non-blocking put; when full, drop the oldest event to keep the stream live"""
+    try:
+        queue.put_nowait(event)
+    except asyncio.QueueFull:
+        try:
+            queue.get_nowait()
+            queue.put_nowait(event)
+        except asyncio.QueueEmpty:
+            pass
+        live_log_dropped[job_id] = live_log_dropped.get(job_id, 0) + 1
+
+def get_queue_metrics() -> Dict[str, Any]:
+    """Backpressure visibility: registry size, depth and drops per job"""
+    return {
+        "registered_jobs": len(live_log_queues),
+        "jobs": {
+            job_id: {
+                "size": queue.qsize(),
+                "dropped": live_log_dropped.get(job_id, 0)
+            }
+            for job_id, (queue, _) in live_log_queues.items()
+        }
+    }
+
+async def drain_batch(queue: asyncio.Queue, max_items: int = 64, max_wait: float = 0.05) -> List[dict]:
+    """
+    Waits up to max_wait for the first event, then takes whatever else is
+    already queued (up to max_items) without awaiting again.
+    Raises TimeoutError if nothing arrives in time.
+    """
+    async with asyncio.timeout(max_wait):
+        batch = [await queue.get()]
+
+    while len(batch) < max_items:
+        try:
+            batch.append(queue.get_nowait())
+        except asyncio.QueueEmpty:
+            break
+
+    return batch
+
+def format_event(event: dict) -> str:
+    """SSE frame for one live-log event; the ns timestamp becomes ISO-8601 only here"""
+    timestamp = event.get("timestamp")
+    if isinstance(timestamp, int):
+        event = {**event, "timestamp": datetime.fromtimestamp(timestamp / 1e9).isoformat()}
+    return f"data: {json.dumps(event)}\n\n"
@@ -1,22 +1,57 @@
+import argparse
 import asyncio
-import sys
+import atexit
 import os
+import secrets
+import threading
 import time
-import json
+import re
+import orjson
 import opik
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
 from typing import Dict, Any
 
 from opik.evaluation import evaluate
 from opik import track
-from opik.evaluation.metrics import Hallucination, BaseMetric, score_result
+from opik.evaluation.metrics import BaseMetric, score_result
 
 # App Imports
 from app.evaluation.runner import SkillProtocolEvaluationRunner
+from app.evaluation.cache import AnalysisCache, JudgeCache
+from app.evaluation.judge import CachedHallucination, get_judge_model
+from app.evaluation.rate_limit import RateLimiter
 from app.core.config import settings
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# Non-blocking logging: evaluation worker threads only enqueue records,
+# a single listener thread does the (blocking) writes to stderr.
+# basicConfig formats records in the QueueHandler; the stream prints them as-is
+_log_queue = queue.SimpleQueue()
+logging.basicConfig(level=logging.INFO, handlers=[QueueHandler(_log_queue)], force=True)
+_log_listener = QueueListener(_log_queue, logging.StreamHandler())
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
+logger = logging.getLogger(__name__)
+
+# Pipeline concurrency and provider rate limit are tuned independently
+TASK_THREADS = 8
+MAX_CONCURRENT_ANALYSES = 4
+MAX_ANALYSES_PER_MINUTE = 30
+
+# One persistent loop for every graph run: evaluate() calls the task from worker
+# threads, and a fresh asyncio.run() per item would rebuild a loop each time
+ANALYSIS_LOOP = asyncio.new_event_loop()
+threading.Thread(target=ANALYSIS_LOOP.run_forever, name="analysis-loop", daemon=True).start()
+
+# Extracts the JSON object from LLM output, ignoring code fences/prose around it
+_FENCE_RE = re.compile(r"^```(?:json)?\s*|\s*```$", re.MULTILINE)
+_JSON_OBJ_RE = re.compile(r"\{.*\}", re.S)
+
 # =========================================================
 # 1. Custom Metrics (SFIA Accuracy)
 # =========================================================
@@ -49,8 +84,9 @@ class SfiaAccuracyMetric(BaseMetric):
             else:
                 # Fallback: Try to parse generic JSON from the output string
                 try:
-                    clean = output.replace("```json", "").replace("```", "").strip()
-                    data = json.loads(clean)
+                    text = _FENCE_RE.sub("", output).strip()
+                    match = _JSON_OBJ_RE.search(text)
+                    data = orjson.loads(match.group(0)) if match else {}
                     predicted = int(data.get("sfia_level", 0))
                 except:
                     predicted = 0
@@ -92,21 +128,31 @@ async def main():
     if settings.OPENROUTER_API_KEY:
         os.environ["OPENROUTER_API_KEY"] = settings.OPENROUTER_API_KEY
     
-    experiment_name = sys.argv[1] if len(sys.argv) > 1 else "OpenRouter-Migration-Test"
+    parser = argparse.ArgumentParser(description="Run the SkillProtocol Opik evaluation")
+    parser.add_argument("experiment_name", nargs="?", default="OpenRouter-Migration-Test")
+    parser.add_argument("--no-cache", action="store_true", help="Always re-run the agent graph")
+    parser.add_argument("--replay-only", action="store_true", help="Only use cached graph results; skip misses")
+    parser.add_argument("--use-cache", action="store_true", help="Reuse cached LLM-judge scores")
+    args = parser.parse_args()
+    
+    experiment_name = args.experiment_name
     
     # 2. Initialize Helper Classes
     runner = SkillProtocolEvaluationRunner()
+    analysis_cache = AnalysisCache(enabled=not args.no_cache)
+    analysis_slots = threading.BoundedSemaphore(MAX_CONCURRENT_ANALYSES)
+    rate_limiter = RateLimiter(max_rate=MAX_ANALYSES_PER_MINUTE, time_period=60)
     client = opik.Opik(project_name=settings.OPIK_PROJECT_NAME)
 
     # 3. Load Dataset
-    print(f"📦 Fetching Dataset 'sfia-golden-v1'...")
+    logger.info("📦 Fetching dataset: %s", "sfia-golden-v1")
     try:
         dataset = client.get_dataset(name="sfia-golden-v1")
         if not dataset:
              raise ValueError("Dataset not found")
     except Exception as e:
-        print(f"❌ Dataset Error: {e}")
-        print("💡 Tip: Run 'python -m app.scripts.run_feedback_loop' to create a dataset first.")
+        logger.error("❌ Dataset error: %s", e)
+        logger.info("💡 Tip: Run 'python -m app.scripts.run_feedback_loop' to create a dataset first.")
         return
 
     # 4. Define the Evaluation Task
@@ -121,18 +167,32 @@ async def main():
         repo_url = dataset_item.get("input")
         
         repo_name = repo_url.split('/')[-1] if repo_url else "unknown"
-        print(f"🔄 Analyzing: {repo_name}")
+        logger.info("🔄 Analyzing %s", repo_name)
 
         try:
-            # Run the actual agents (using asyncio.run since evaluate() expects a sync function)
-            # We create a unique job_id for this specific evaluation run
-            job_id = f"eval_{repo_name}_{int(time.time())}"
+            # Run the actual agents on the shared loop (evaluate() expects a sync function)
+            # Unique job_id per run: it is the LangGraph thread_id, and items now run concurrently
+            job_id = f"eval_{repo_name}_{int(time.time())}_{secrets.token_hex(4)}"
+            
+            # Replay mode: reuse the cached graph result and only re-run metrics
+            final_state = analysis_cache.get(repo_url, settings.DEFAULT_MODEL)
             
-            final_state = asyncio.run(runner.run_analysis_internal(
-                repo_url=repo_url,
-                job_id=job_id,
-                model=settings.DEFAULT_MODEL 
-            ))
+            if final_state is None:
+                if args.replay_only:
+                    raise RuntimeError("No cached result (--replay-only)")
+                
+                with analysis_slots, rate_limiter:
+                    final_state = asyncio.run_coroutine_threadsafe(
+                        runner.run_analysis_internal(
+                            repo_url=repo_url,
+                            job_id=job_id,
+                            model=settings.DEFAULT_MODEL 
+                        ),
+                        ANALYSIS_LOOP
+                    ).result()
+                analysis_cache.set(repo_url, settings.DEFAULT_MODEL, final_state)
+            else:
+                logger.info("♻️  Cache hit: %s", repo_name)
 
             # Extract results from the agent state
             sfia_result = final_state.get("sfia_result", {})
@@ -147,7 +207,7 @@ async def main():
             context_str = (
                 f"Data: SLOC={ncrf.get('total_sloc')}, "
                 f"Complexity={ncrf.get('total_complexity')}, "
-                f"Markers={scan_metrics.get('markers', {})}. "
+                f"Markers={orjson.dumps(scan_metrics.get('markers', {})).decode()}. "
                 f"Bayesian Estimate: {validation.get('bayesian_best_estimate')}"
             )
 
@@ -162,7 +222,7 @@ async def main():
             }
 
         except Exception as e:
-            print(f"❌ Error processing {repo_name}: {e}")
+            logger.error("❌ Error processing %s: %s", repo_name, e)
             return {
                 "input": repo_url, 
                 "output": f"Error: {str(e)}", 
@@ -174,9 +234,11 @@ async def main():
     # 5. Configure Metrics
     
     # Hallucination Metric (LLM-as-a-Judge)
-    hallucination_metric = Hallucination(
+    # Shared judge: every LLM-as-a-judge metric reuses one model and connection pool
+    hallucination_metric = CachedHallucination(
         name="Hallucination_Check",
-        model="openrouter/google/gemini-2.0-flash-001" 
+        model=get_judge_model("openrouter/google/gemini-2.0-flash-001"),
+        cache=JudgeCache() if args.use_cache else None
     )
 
     # Accuracy Metric (Heuristic/Custom)
@@ -185,16 +247,32 @@ async def main():
     eval_metrics = [accuracy_metric, hallucination_metric]
 
     # 6. Start Evaluation
-    print(f"\n🚀 Starting Experiment: {experiment_name}")
+    logger.info("🚀 Starting experiment: %s", experiment_name)
     
     evaluate(
         dataset=dataset,
         task=evaluation_task,
         scoring_metrics=eval_metrics,
         experiment_name=experiment_name,
-        task_threads=1, # Keep strictly 1 to avoid Rate Limits/Async loop conflicts
+        task_threads=TASK_THREADS, # Rate limits are enforced inside evaluation_task
         project_name=settings.OPIK_PROJECT_NAME
     )
 
+def run_main():
+    """
+    Runs main() on a fresh loop with eager task execution (Python 3.12+):
+    coroutines that finish without suspending skip the scheduler hop.
+    """
+    loop = asyncio.new_event_loop()
+    eager_factory = getattr(asyncio, "eager_task_factory", None)
+    if eager_factory is not None:
+        loop.set_task_factory(eager_factory)
+    asyncio.set_event_loop(loop)
+    try:
+        loop.run_until_complete(main())
+    finally:
+        asyncio.set_event_loop(None)
+        loop.close()
+
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    run_main()
\ No newline at end of file
@@ -6,52 +6,132 @@ NOW FETCHES THE SEED PROMPT FROM THE OPIK LIBRARY.
 import os
 import sys
 import asyncio
-import json
 import logging
-from typing import Any, Dict
+import secrets
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, Dict
 
-import opik
-from opik_optimizer import ChatPrompt, MetaPromptOptimizer, OptimizableAgent
-from opik.evaluation.metrics import score_result
+import orjson
 
 # App Imports
 from app.core.config import settings
 from app.core.state import AnalysisState
-from app.agents.judge import arbitrate_level
 
-# Configure Logging
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
+# opik / opik_optimizer / the agent graph are imported on first use (see main())
+if TYPE_CHECKING:
+    from opik_optimizer import ChatPrompt
 
-# Fix for Opik progress bar bug
-os.environ["OPIK_DISABLE_PROGRESS_BARS"] = "true"
+logger = logging.getLogger(__name__)
 
 # --- 1. CONFIGURATION ---
-if settings.OPIK_API_KEY:
-    os.environ["OPIK_API_KEY"] = settings.OPIK_API_KEY
-if settings.OPIK_WORKSPACE:
-    os.environ["OPIK_WORKSPACE"] = settings.OPIK_WORKSPACE
-if settings.OPENROUTER_API_KEY:
-    os.environ["OPENROUTER_API_KEY"] = settings.OPENROUTER_API_KEY
+def configure_environment():
+    """Logging and provider env vars; must run before opik is imported"""
+    logging.basicConfig(level=logging.INFO)
+
+    # Fix for Opik progress bar bug
+    os.environ["OPIK_DISABLE_PROGRESS_BARS"] = "true"
+
+    if settings.OPIK_API_KEY:
+        os.environ["OPIK_API_KEY"] = settings.OPIK_API_KEY
+    if settings.OPIK_WORKSPACE:
+        os.environ["OPIK_WORKSPACE"] = settings.OPIK_WORKSPACE
+    if settings.OPENROUTER_API_KEY:
+        os.environ["OPENROUTER_API_KEY"] = settings.OPENROUTER_API_KEY
+
+# LiteLLM routes OpenRouter models by prefix
+_PREFIX = "openrouter/"
+
+def _norm(model: str) -> str:
+    return model if model.startswith(_PREFIX) else _PREFIX + model
+
+# Normalised once; interned so cache keys downstream compare by identity
+OPTIMIZER_MODEL = sys.intern(_norm(settings.DEFAULT_MODEL))
+JUDGE_MODEL = sys.intern(_norm(settings.JUDGE_MODEL))
+
+# Cap on dataset items scored in parallel per round (each one is an LLM
+# round-trip). Deliberately below MetaPromptOptimizer's default of 12 threads
+# so a round stays within the OpenRouter rate limit.
+MAX_CONCURRENCY = 8
+
+# Upper bound on one arbitrate_level() call (seconds)
+AGENT_TIMEOUT = 120
+
+# One persistent loop for every agent call: the optimizer invokes the agent from
+# worker threads, and asyncio.run() per item would rebuild the loop and drop the
+# LLM client's keep-alive connections each time. Started on first use.
+_agent_loop = None
+_agent_loop_lock = threading.Lock()
+
+
+def get_agent_loop() -> asyncio.AbstractEventLoop:
+    """
+    Get or start the background agent loop
+    """
+    global _agent_loop
 
-def get_model_name(model: str) -> str:
-    return f"openrouter/{model}" if not model.startswith("openrouter/") else model
+    with _agent_loop_lock:
+        if _agent_loop is None:
+            _agent_loop = asyncio.new_event_loop()
+            threading.Thread(target=_agent_loop.run_forever, name="judge-agent-loop", daemon=True).start()
 
-OPTIMIZER_MODEL = get_model_name(settings.DEFAULT_MODEL) 
-JUDGE_MODEL = get_model_name(settings.JUDGE_MODEL)
+    return _agent_loop
 
 # --- 2. CUSTOM AGENT ADAPTER ---
-class JudgeOptimizerAgent(OptimizableAgent):
+# Fixed part of the mock state, copied per call (read-only so it can't drift)
+_BASE_STATE = MappingProxyType({
+    "user_id": "optimizer_bot",
+    "current_step": "judge",
+    "progress": 50
+})
+
+
+# Caps in-flight arbitrate_level() calls on the agent loop
+AGENT_SEMAPHORE = asyncio.Semaphore(MAX_CONCURRENCY)
+
+
+async def _arbitrate(state: AnalysisState) -> AnalysisState:
+    from app.agents.judge import arbitrate_level
+
+    async with AGENT_SEMAPHORE:
+        async with asyncio.timeout(AGENT_TIMEOUT):
+            return await arbitrate_level(state)
+
+
+def _format_result(result_state: AnalysisState) -> str:
+    final_level = result_state["sfia_result"].get("sfia_level")
+    reasoning = result_state["sfia_result"].get("judge_summary")
+    return orjson.dumps({"final_level": final_level, "reasoning": reasoning}).decode()
+
+
+def _format_error(e: BaseException) -> str:
+    return orjson.dumps({"error": str(e) or type(e).__name__, "final_level": 0}).decode()
+
+
+class JudgeOptimizerAgentMixin:
     """
     Connects the Opik Optimizer to the actual SkillProtocol Judge Agent code.
+    Combined with OptimizableAgent by get_judge_agent_class().
     """
     def invoke_agent(
         self,
-        prompts: Dict[str, ChatPrompt],
+        prompts: Dict[str, "ChatPrompt"],
         dataset_item: Dict[str, Any],
         allow_tool_use: bool = False,
         seed: int | None = None,
     ) -> str:
+        mock_state = self._build_state(prompts, dataset_item)
+
+        try:
+            future = asyncio.run_coroutine_threadsafe(_arbitrate(mock_state), get_agent_loop())
+            return _format_result(future.result())
+        except Exception as e:
+            return _format_error(e)
+
+    def _build_state(self, prompts: Dict[str, "ChatPrompt"], dataset_item: Dict[str, Any]) -> AnalysisState:
         # Extract the optimized prompt text
         optimized_prompt_obj = list(prompts.values())[0]
         messages = optimized_prompt_obj.get_messages(dataset_item)
@@ -60,12 +140,10 @@ class JudgeOptimizerAgent(OptimizableAgent):
         system_prompt_text = messages[0]["content"]
 
         # Mock State
-        mock_state: AnalysisState = {
-            "job_id": f"opt_{os.urandom(4).hex()}",
+        mock_state: AnalysisState = dict(_BASE_STATE)
+        mock_state.update({
+            "job_id": f"opt_{secrets.token_hex(4)}",
             "repo_url": dataset_item.get("input", "http://github.com/mock/repo"),
-            "user_id": "optimizer_bot",
-            "current_step": "judge",
-            "progress": 50,
             "scan_metrics": {
                 "ncrf": {
                     "total_sloc": dataset_item.get("sloc", 5000),
@@ -89,57 +167,110 @@ class JudgeOptimizerAgent(OptimizableAgent):
             },
             # Injecting the prompt override
             "optimizer_override_prompt": system_prompt_text 
-        }
+        })
+
+        return mock_state
+
+
+@lru_cache(maxsize=None)
+def get_judge_agent_class():
+    """JudgeOptimizerAgent, built on first use so opik_optimizer loads lazily"""
+    from opik_optimizer import OptimizableAgent
+
+    return type(
+        "JudgeOptimizerAgent",
+        (JudgeOptimizerAgentMixin, OptimizableAgent),
+        {"__doc__": JudgeOptimizerAgentMixin.__doc__}
+    )
 
-        try:
-            result_state = asyncio.run(arbitrate_level(mock_state))
-            final_level = result_state["sfia_result"].get("sfia_level")
-            reasoning = result_state["sfia_result"].get("judge_summary")
-            return json.dumps({"final_level": final_level, "reasoning": reasoning})
-        except Exception as e:
-            return json.dumps({"error": str(e), "final_level": 0})
 
 # --- 3. METRIC ---
+# Score by level distance: exact, off by one, anything further
+_SCORE_TABLE = (1.0, 0.5, 0.0)
+_SCORE_REASONS = ("Exact Match", "Close Call (+/- 1)")
+
 def judge_accuracy_metric(dataset_item, llm_output):
+    from opik.evaluation.metrics import score_result
+
+    # Agent failures are marked in-band by invoke_agent: no need to parse them
+    if llm_output.startswith('{"error"'):
+        return score_result.ScoreResult(name="Accuracy", value=0.0, reason="Agent error")
+
     try:
-        output_json = json.loads(llm_output)
+        output_json = orjson.loads(llm_output)
         predicted_level = int(output_json.get("final_level", 0))
         expected_level = int(dataset_item.get("expected_sfia_level", 0))
         
         if expected_level == 0: return score_result.ScoreResult(name="Accuracy", value=0.0, reason="Invalid Ground Truth")
 
-        if predicted_level == expected_level:
-            return score_result.ScoreResult(name="Accuracy", value=1.0, reason="Exact Match")
-        elif abs(predicted_level - expected_level) == 1:
-            return score_result.ScoreResult(name="Accuracy", value=0.5, reason="Close Call (+/- 1)")
-        else:
-            return score_result.ScoreResult(name="Accuracy", value=0.0, reason=f"Miss (Pred: {predicted_level}, Exp: {expected_level})")
+        idx = min(abs(predicted_level - expected_level), 2)
+        # Misses keep the levels in the reason for the dashboard
+        reason = _SCORE_REASONS[idx] if idx < 2 else f"Miss (Pred: {predicted_level}, Exp: {expected_level})"
+        return score_result.ScoreResult(name="Accuracy", value=_SCORE_TABLE[idx], reason=reason)
     except Exception as e:
         return score_result.ScoreResult(name="Accuracy", value=0.0, reason=f"Metric Error: {e}")
 
+def count_dataset_items(dataset) -> int:
+    """Item count without materialising the items when the SDK reports it"""
+    count = getattr(dataset, "dataset_items_count", None)
+    if isinstance(count, int):
+        return count
+    return sum(1 for _ in dataset.get_items())
+
+
+# --- 4. HISTORY ---
+# One history file per run: judge_history_<YYYYmmdd-HHMMSS>.jsonl
+HISTORY_FILE_TEMPLATE = "judge_history_{run_id}.jsonl"
+
+
+def _history_default(obj):
+    if hasattr(obj, "model_dump"):
+        return obj.model_dump()
+    return str(obj)
+
+
+def write_history(history, path: str):
+    """Writes one JSON line per trial record to this run's file (no pretty-printed document)"""
+    with open(path, "wb") as f:
+        for record in history or []:
+            if hasattr(record, "model_dump"):
+                record = record.model_dump()
+            f.write(orjson.dumps(record, default=_history_default) + b"\n")
+
+
 def main():
     max_trials = int(sys.argv[1]) if len(sys.argv) > 1 else 10
     
+    configure_environment()
+
+    import opik
+    from app.core.opik_http import tune_opik_client
+    from app.evaluation.optimizer import build_optimizer, build_prompt
+
     print(f"🚀 Starting Judge Optimizer (Budget: {max_trials} trials)")
     
     # 1. Initialize Client
     client = opik.Opik(project_name=settings.OPIK_PROJECT_NAME)
+    tune_opik_client(client)
 
-    # 2. Get Dataset
-    dataset = client.get_dataset(name="sfia-golden-v1")
+    # 2. Get Dataset and seed prompt concurrently (independent round-trips)
+    PROMPT_NAME = "judge-agent-rubric"
+    print(f"📥 Fetching dataset and latest prompt '{PROMPT_NAME}' from Opik Library...")
+    
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        dataset_future = executor.submit(client.get_dataset, name="sfia-golden-v1")
+        prompt_future = executor.submit(client.get_prompt, name=PROMPT_NAME)
+    
+    dataset = dataset_future.result()
     if not dataset:
         print("❌ Dataset not found")
         return
-    dataset_items = dataset.get_items()
-    print(f"📦 Dataset loaded: {len(dataset_items)} items")
+    print(f"📦 Dataset loaded: {count_dataset_items(dataset)} items")
 
     # --- 3. FETCH PROMPT FROM OPIK LIBRARY ---
-    PROMPT_NAME = "judge-agent-rubric"
-    print(f"📥 Fetching latest prompt '{PROMPT_NAME}' from Opik Library...")
-    
     try:
         # Fetch the Prompt object from the Library
-        library_prompt = client.get_prompt(name=PROMPT_NAME)
+        library_prompt = prompt_future.result()
         
         if not library_prompt:
             raise ValueError(f"Prompt '{PROMPT_NAME}' not found in Opik!")
@@ -149,19 +280,11 @@ def main():
         current_template = library_prompt.prompt 
 
         # We construct a ChatPrompt using this fetched template
-        initial_prompt = ChatPrompt(
-            name=PROMPT_NAME,
-            messages=[
-                {
-                    "role": "system",
-                    "content": current_template # <--- Using the fetched content here
-                },
-                {
-                    "role": "user",
-                    "content": "Review the evidence and render your verdict."
-                }
-            ],
-            model=JUDGE_MODEL
+        initial_prompt = build_prompt(
+            PROMPT_NAME,
+            current_template, # <--- Using the fetched content here
+            "Review the evidence and render your verdict.",
+            JUDGE_MODEL
         )
         print("✅ Successfully loaded seed prompt from Library")
 
@@ -171,17 +294,18 @@ def main():
         return
 
     # 4. Initialize Optimizer
-    optimizer = MetaPromptOptimizer(
-        model=OPTIMIZER_MODEL,
+    optimizer = build_optimizer(
+        OPTIMIZER_MODEL,
         prompts_per_round=2,
-        verbose=1
+        verbose=1,
+        n_threads=MAX_CONCURRENCY
     )
 
     # 5. Run Optimization
     try:
         result = optimizer.optimize_prompt(
             prompt=initial_prompt,
-            agent_class=JudgeOptimizerAgent,
+            agent_class=get_judge_agent_class(),
             dataset=dataset,
             metric=judge_accuracy_metric,
             max_trials=max_trials,
@@ -198,14 +322,16 @@ def main():
         print("\n✨ WINNING PROMPT TEMPLATE:")
         print(result.prompt.messages[0]['content'])
 
-        # Save to file
-        with open("judge_optimized_prompt.json", "w") as f:
-            json.dump({
+        # Save to file: thin summary, per-trial history as this run's JSONL
+        history_file = HISTORY_FILE_TEMPLATE.format(run_id=time.strftime("%Y%m%d-%H%M%S"))
+        write_history(result.history, history_file)
+        with open("judge_optimized_prompt.json", "wb") as f:
+            f.write(orjson.dumps({
                 "prompt": result.prompt.messages[0]['content'],
                 "score": result.score,
-                "history": result.history
-            }, f, indent=2)
-        print("\n💾 Saved to judge_optimized_prompt.json")
+                "history_file": history_file
+            }, option=orjson.OPT_INDENT_2))
+        print(f"\n💾 Saved to judge_optimized_prompt.json (history: {history_file})")
         
         # Optional: Push back to Opik as a NEW version or NEW prompt name?
         # client.create_prompt(name="judge-agent-rubric-optimized", prompt=result.prompt.messages[0]['content'])
@@ -1,6 +1,9 @@
 # test_opik_prompts.py
+from concurrent.futures import ThreadPoolExecutor
+
 import opik
 from app.core.config import settings
+from app.core.opik_http import tune_opik_client
 
 client = opik.Opik(
     project_name=settings.OPIK_PROJECT_NAME,
@@ -8,6 +11,7 @@ client = opik.Opik(
     workspace=settings.OPIK_WORKSPACE,
     host="https://www.comet.com/opik/api"
 )
+tune_opik_client(client)
 
 required_prompts = [
     "reviewer-agent-deposition",
@@ -17,9 +21,19 @@ required_prompts = [
 
 print("🔍 Checking Opik Prompt Library...\n")
 
-for prompt_name in required_prompts:
+def fetch_prompt(prompt_name):
     try:
-        prompt = client.get_prompt(name=prompt_name)
-        print(f"✅ Found: {prompt_name}")
+        client.get_prompt(name=prompt_name)
+        return None
     except Exception as e:
-        print(f"❌ Missing: {prompt_name} - {str(e)}")
\ No newline at end of file
+        return e
+
+# Fetch all prompts concurrently (each lookup is a blocking HTTPS round-trip)
+with ThreadPoolExecutor(max_workers=len(required_prompts)) as executor:
+    errors = list(executor.map(fetch_prompt, required_prompts))
+
+for prompt_name, error in zip(required_prompts, errors):
+    if error is None:
+        print(f"✅ Found: {prompt_name}")
+    else:
+        print(f"❌ Missing: {prompt_name} - {str(error)}")